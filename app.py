@@ -2,11 +2,13 @@ import streamlit as st
 import pandas as pd
 import sys
 import os
+from datetime import date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.db import get_all_systems, get_dashboard_stats, get_all_services
-from utils.charts import create_status_pie, create_progress_histogram, create_dept_bar
+from database.db import get_dashboard_stats, get_all_services, get_data_versions
+from database.records import get_shared_system_records
+from utils.charts import create_status_pie, create_progress_histogram, create_dept_bar, progress_bins
 
 # 페이지 설정
 st.set_page_config(
@@ -125,16 +127,18 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# 데이터 로드
-@st.cache_data(ttl=60)
-def load_dashboard_data():
-    systems = get_all_systems()
+# 데이터 로드 (데이터 버전이나 날짜가 바뀔 때만 다시 조회)
+# 미업데이트 알림, 이번 달 신규 등 오늘 기준 값과 일별 스냅샷 기록이 있어 날짜도 캐시 키에 포함
+@st.cache_data(max_entries=4)
+def load_dashboard_data(versions, today):
     stats = get_dashboard_stats()
     services = get_all_services()
-    return systems, stats, services
+    return stats, services
 
 
-systems, stats, services = load_dashboard_data()
+# 시스템 목록은 세션마다 복사하지 않고 프로세스 공용 인스턴스를 읽음
+systems = get_shared_system_records()
+stats, services = load_dashboard_data(get_data_versions('systems', 'services', 'system_daily_snapshots'), date.today())
 
 # KPI 메트릭
 st.markdown("<p class='section-title'>핵심 지표</p>", unsafe_allow_html=True)
@@ -158,7 +162,11 @@ with col3:
     st.metric("개발 중", stats['developing'])
 
 with col4:
-    st.metric("평균 진행률", f"{stats['avg_progress']:.0%}")
+    st.metric(
+        "평균 진행률",
+        f"{stats['avg_progress']:.0%}",
+        delta=f"{stats['progress_change']:+.0%} 전월 대비" if stats['progress_change'] else None
+    )
 
 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -168,16 +176,16 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.caption("상태별 분포")
-    if systems:
-        fig_status = create_status_pie(systems)
+    if len(systems) > 0:
+        fig_status = create_status_pie(stats['status_counts'])
         st.plotly_chart(fig_status, use_container_width=True)
     else:
         st.info("등록된 시스템이 없습니다.")
 
 with col2:
     st.caption("진행률 분포")
-    if systems:
-        fig_progress = create_progress_histogram(systems)
+    if len(systems) > 0:
+        fig_progress = create_progress_histogram(progress_bins(systems.column('progress')))
         st.plotly_chart(fig_progress, use_container_width=True)
     else:
         st.info("등록된 시스템이 없습니다.")
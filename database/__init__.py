@@ -1,21 +1,45 @@
-from .models import Base, System, SystemHistory, Service, Attachment, Comment
+from .models import Base, System, SystemHistory, SystemDepartment, DashboardStat, DataVersion, Service, Attachment, Comment, ImportCheckpoint, SystemHistoryArchive, SystemSnapshot, DailySystemSnapshot, ServiceCostSnapshot, ServiceCostMonthly
 from .db import (
     get_engine,
     get_session,
+    session_scope,
     init_db,
+    checkpoint_db,
+    get_data_versions,
     get_all_systems,
+    get_system_records,
+    iter_systems,
+    count_systems,
+    query_systems,
+    query_systems_after,
+    count_systems_by_status,
+    search_systems,
+    get_filter_facets,
     get_system_by_id,
     get_system_by_name,
     create_system,
     update_system,
     delete_system,
+    bulk_upsert_systems,
+    get_import_checkpoint,
+    save_import_checkpoint,
+    clear_import_checkpoint,
     get_all_services,
     create_service,
     update_service,
     delete_service,
+    get_monthly_costs,
     get_system_history,
+    get_system_history_page,
+    count_system_history,
+    get_history_filter_options,
+    compact_history,
+    get_systems_as_of,
     record_history,
     get_dashboard_stats,
+    get_daily_snapshots,
+    rebuild_dashboard_stats,
     get_all_departments,
     get_all_platforms
 )
+from .records import SystemRecord, SystemRecords, get_shared_system_records
@@ -1,74 +1,248 @@
+import ast
+import json
 import os
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker
-from .models import Base, System, SystemHistory, Service, Attachment, Comment
+import threading
+import zlib
+from contextlib import contextmanager
+from itertools import islice
+from datetime import date, datetime, timedelta
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, JSON, create_engine, delete, event, func, insert, inspect, literal, or_, select, text, tuple_, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from .models import Base, System, SystemHistory, SystemHistoryArchive, SystemSnapshot, DailySystemSnapshot, ServiceCostSnapshot, ServiceCostMonthly, SystemDepartment, DashboardStat, DataVersion, Service, Attachment, Comment, ImportCheckpoint
 
 # DB 경로 설정
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
 
-DB_PATH = os.path.join(DATA_DIR, 'dev_systems.db')
+DB_PATH = os.environ.get('DEV_SYSTEMS_DB_PATH', os.path.join(DATA_DIR, 'dev_systems.db'))
+
+# SQLite 연결 PRAGMA 프로파일 (환경변수 DEV_SYSTEMS_SQLITE_<이름> 으로 변경 가능)
+# WAL 모드에서는 쓰기 트랜잭션 중에도 다른 세션의 읽기가 막히지 않는다.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('DEV_SYSTEMS_SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('DEV_SYSTEMS_SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('DEV_SYSTEMS_SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+    'cache_size': int(os.environ.get('DEV_SYSTEMS_SQLITE_CACHE_SIZE', -20000)),  # 음수: KiB 단위
+    'mmap_size': int(os.environ.get('DEV_SYSTEMS_SQLITE_MMAP_SIZE', 268435456)),  # bytes
+}
+
+# 이 일수보다 오래된 변경 이력은 compact_history()가 압축 보관 테이블로 옮긴다
+HISTORY_ARCHIVE_DAYS = int(os.environ.get('DEV_SYSTEMS_HISTORY_ARCHIVE_DAYS', 180))
+
+
+# 프로세스 공용 엔진/세션 팩토리 (모듈 전역이므로 Streamlit rerun 간에도 유지됨)
+_engine = None
+_session_factory = None
+_scoped_session = None
+_engine_lock = threading.Lock()
+
+
+def create_sqlite_engine(db_path, pragmas=None):
+    """PRAGMA 프로파일이 모든 연결에 적용되는 SQLite 엔진 생성"""
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        echo=False,
+        connect_args={'check_same_thread': False}
+    )
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        # pysqlite의 암묵적 BEGIN을 끄고 아래 'begin'에서 직접 시작 (SAVEPOINT가 올바르게 동작하도록)
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+    return engine
 
 
 def get_engine():
-    """SQLAlchemy 엔진 반환"""
-    return create_engine(f"sqlite:///{DB_PATH}", echo=False)
+    """SQLAlchemy 엔진 반환 (프로세스당 1회 생성)"""
+    global _engine, _session_factory, _scoped_session
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_sqlite_engine(DB_PATH)
+                _session_factory = sessionmaker(bind=engine)
+                _scoped_session = scoped_session(_session_factory)
+                _engine = engine
+    return _engine
 
 
 def get_session():
-    """새 세션 생성"""
-    engine = get_engine()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    """새 세션 생성 (호출자가 commit/close 책임)"""
+    get_engine()
+    return _session_factory()
+
+
+@contextmanager
+def session_scope():
+    """트랜잭션 범위 세션
+
+    스레드별 세션 레지스트리를 사용하므로, 이미 열린 범위 안에서 호출되면
+    같은 세션에 합류하고 커밋/종료는 가장 바깥 범위가 담당한다.
+
+        with session_scope():
+            create_system(data)
+            record_history(...)   # 하나의 트랜잭션으로 커밋
+    """
+    get_engine()
+    if _scoped_session.registry.has():
+        yield _scoped_session()
+        return
+
+    session = _scoped_session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        _scoped_session.remove()
 
 
 def init_db():
-    """데이터베이스 초기화 (테이블 생성)"""
+    """데이터베이스 초기화 (테이블 생성 및 미적용 마이그레이션 실행)"""
     engine = get_engine()
     Base.metadata.create_all(engine)
 
+    # 적용된 마이그레이션 수는 SQLite user_version에 기록
+    with engine.begin() as conn:
+        version = conn.execute(text("PRAGMA user_version")).scalar()
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(conn)
+            conn.execute(text(f"PRAGMA user_version = {number}"))
+
+
+def checkpoint_db():
+    """WAL 내용을 DB 파일에 반영 (파일 단위 백업 전에 호출)"""
+    with get_engine().connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+
+# ============== 데이터 버전 ==============
+
+def get_data_versions(*table_names):
+    """테이블별 데이터 버전을 인자 순서대로 튜플로 반환 (캐시 키용, 기록이 없으면 0)
+
+        @st.cache_data
+        def load_services(versions):
+            return get_all_services()
+
+        services = load_services(get_data_versions('services'))
+    """
+    with get_engine().connect() as conn:
+        versions = dict(conn.execute(
+            select(DataVersion.table_name, DataVersion.version)
+            .where(DataVersion.table_name.in_(table_names))
+        ).all())
+    return tuple(versions.get(name, 0) for name in table_names)
+
+
+def bump_data_versions(connection, table_names):
+    """쓰기가 발생한 테이블의 버전을 1씩 증가"""
+    if not table_names:
+        return
+    stmt = sqlite_insert(DataVersion)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['table_name'],
+        set_={'version': DataVersion.version + 1}
+    )
+    connection.execute(stmt, [{'table_name': name, 'version': 1} for name in sorted(table_names)])
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_flushed_versions(session, flush_context):
+    """flush된 객체의 테이블 버전을 같은 트랜잭션에서 증가"""
+    table_names = {obj.__tablename__ for obj in session.new}
+    table_names.update(obj.__tablename__ for obj in session.deleted)
+    table_names.update(
+        obj.__tablename__ for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    )
+    table_names.discard(DataVersion.__tablename__)
+    bump_data_versions(session.connection(), table_names)
+
 
 # ============== 시스템 CRUD ==============
 
+# 분류형 문자열 컬럼 (SystemRecords에서 정수 코드 + 범주로 보관)
+SYSTEM_CATEGORY_COLUMNS = (
+    'status', 'frontend_platform', 'frontend_plan', 'backend_platform', 'backend_plan', 'owner', 'created_by'
+)
+
+
+def _systems_select(include_deleted=False, columns=None):
+    """시스템 테이블 Core select (columns를 주면 해당 컬럼만, 최근 수정순)"""
+    table = System.__table__
+    selected = [table.c[c] for c in columns if c in table.c] if columns else list(table.c)
+    stmt = select(*selected)
+    if not include_deleted:
+        stmt = stmt.where(table.c.is_deleted == False)
+    return stmt.order_by(table.c.updated_at.desc())
+
+
 def get_all_systems(include_deleted=False):
     """모든 시스템 조회"""
-    session = get_session()
-    try:
-        query = session.query(System)
-        if not include_deleted:
-            query = query.filter(System.is_deleted == False)
-        systems = query.order_by(System.updated_at.desc()).all()
-        return [s.to_dict() for s in systems]
-    finally:
-        session.close()
+    return get_system_records(include_deleted=include_deleted)
+
+
+def get_system_records(include_deleted=False, columns=None):
+    """시스템을 dict 목록으로 조회 (ORM 객체 없이 Core select 결과에서 바로 생성)
+
+    columns를 주면 해당 키만 담은 가벼운 dict를 반환한다.
+    """
+    with get_engine().connect() as conn:
+        records = [dict(row) for row in conn.execute(_systems_select(include_deleted, columns)).mappings()]
+    if records and 'departments' in records[0]:
+        for record in records:
+            record['departments'] = record['departments'] or []
+    return records
+
+
+def iter_systems(include_deleted=False, columns=None, batch_size=1000):
+    """시스템을 서버측 커서로 batch_size씩 읽어 한 건씩 dict로 반환 (대용량 내보내기용)
+
+    ORM 객체를 만들지 않으며, columns를 주면 해당 컬럼만 조회한다.
+    """
+    with get_engine().connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(_systems_select(include_deleted, columns))
+        for row in result.mappings():
+            row = dict(row)
+            if 'departments' in row:
+                row['departments'] = row['departments'] or []
+            yield row
 
 
 def get_system_by_id(system_id):
     """ID로 시스템 조회"""
-    session = get_session()
-    try:
+    with session_scope() as session:
         system = session.query(System).filter(System.id == system_id).first()
         return system.to_dict() if system else None
-    finally:
-        session.close()
 
 
 def get_system_by_name(system_name):
     """이름으로 시스템 조회"""
-    session = get_session()
-    try:
+    with session_scope() as session:
         system = session.query(System).filter(System.system_name == system_name).first()
         return system.to_dict() if system else None
-    finally:
-        session.close()
 
 
 def create_system(data):
     """시스템 생성"""
-    session = get_session()
-    try:
+    ensure_daily_snapshot()
+    with session_scope() as session:
         system = System(
             system_name=data.get('system_name'),
             description=data.get('description', ''),
@@ -88,7 +262,7 @@ def create_system(data):
             created_by=data.get('created_by', '')
         )
         session.add(system)
-        session.commit()
+        session.flush()
 
         # 이력 기록
         record_history(
@@ -98,51 +272,45 @@ def create_system(data):
             new_value='시스템 생성',
             changed_by=data.get('created_by', '')
         )
+        session.flush()
+        _take_system_snapshots(session, [system.id], force=True)
 
         return system.id
-    finally:
-        session.close()
 
 
 def update_system(system_id, data, changed_by=''):
-    """시스템 수정 및 이력 기록"""
-    session = get_session()
-    try:
+    """시스템 수정 및 이력 기록
+
+    필드별 이력은 before_flush 리스너(_track_system_changes)가 같은 트랜잭션에서 기록한다.
+    """
+    ensure_daily_snapshot()
+    with session_scope() as session:
         system = session.query(System).filter(System.id == system_id).first()
 
         if system:
-            # 변경사항 추적
-            for key, new_value in data.items():
-                if hasattr(system, key):
-                    old_value = getattr(system, key)
-                    if old_value != new_value:
-                        # 이력 기록
-                        record_history(
-                            system_id=system_id,
-                            field_name=key,
-                            old_value=str(old_value) if old_value is not None else '',
-                            new_value=str(new_value) if new_value is not None else '',
-                            changed_by=changed_by
-                        )
+            session.info['changed_by'] = changed_by
+            try:
+                for key, new_value in data.items():
+                    if hasattr(system, key) and getattr(system, key) != new_value:
                         setattr(system, key, new_value)
 
-            system.updated_at = datetime.now()
-            session.commit()
+                system.updated_at = datetime.now()
+                session.flush()
+                _take_system_snapshots(session, [system_id])
+            finally:
+                session.info.pop('changed_by', None)
             return True
         return False
-    finally:
-        session.close()
 
 
 def delete_system(system_id, deleted_by=''):
     """시스템 삭제 (소프트 삭제)"""
-    session = get_session()
-    try:
+    ensure_daily_snapshot()
+    with session_scope() as session:
         system = session.query(System).filter(System.id == system_id).first()
         if system:
             system.is_deleted = True
             system.updated_at = datetime.now()
-            session.commit()
 
             record_history(
                 system_id=system_id,
@@ -151,28 +319,462 @@ def delete_system(system_id, deleted_by=''):
                 new_value='deleted',
                 changed_by=deleted_by
             )
+            session.flush()
+            _take_system_snapshots(session, [system_id])
             return True
         return False
-    finally:
-        session.close()
+
+
+# ============== 시스템 검색 (필터/정렬/페이지) ==============
+
+SYSTEM_SORT_COLUMNS = {
+    'updated_at': System.updated_at,
+    'system_name': System.system_name,
+    'progress': System.progress,
+    'created_at': System.created_at
+}
+
+
+def _system_filter_conditions(filters):
+    """목록 필터 dict를 SQL 조건 목록으로 변환
+
+    filters 키 (모두 선택):
+        statuses: 상태 목록, departments: 부서 목록 (하나라도 포함), owners: 담당자 목록,
+        progress_range: (최소, 최대) 퍼센트, frontend_platform / backend_platform: 플랫폼명,
+        search: 시스템명/개요/비고/API 정보 검색 (systems_fts 전문 검색)
+    """
+    filters = filters or {}
+    conditions = [System.is_deleted == False]
+
+    if filters.get('statuses'):
+        conditions.append(System.status.in_(filters['statuses']))
+
+    if filters.get('departments'):
+        conditions.append(System.id.in_(
+            select(SystemDepartment.system_id)
+            .where(SystemDepartment.department.in_(filters['departments']))
+        ))
+
+    if filters.get('owners'):
+        conditions.append(System.owner.in_(filters['owners']))
+
+    if filters.get('progress_range'):
+        low, high = filters['progress_range']
+        conditions.append((System.progress * 100 >= low) & (System.progress * 100 <= high))
+
+    if filters.get('frontend_platform'):
+        conditions.append(System.frontend_platform == filters['frontend_platform'])
+
+    if filters.get('backend_platform'):
+        conditions.append(System.backend_platform == filters['backend_platform'])
+
+    if filters.get('search'):
+        conditions.append(_system_search_condition(filters['search']))
+
+    return conditions
+
+
+def count_systems(filters=None):
+    """필터 조건에 맞는 시스템 수"""
+    with session_scope() as session:
+        return session.execute(
+            select(func.count(System.id)).where(*_system_filter_conditions(filters))
+        ).scalar()
+
+
+def query_systems(filters=None, sort=('updated_at', 'desc'), limit=None, offset=0):
+    """필터/정렬/페이지를 SQL에서 처리한 시스템 목록
+
+    sort는 (SYSTEM_SORT_COLUMNS 키, 'asc' 또는 'desc'),
+    반환값은 {'systems': 해당 페이지 dict 목록, 'total': 전체 일치 수}.
+    """
+    column, direction = sort
+    order = SYSTEM_SORT_COLUMNS[column]
+    order = order.asc() if direction == 'asc' else order.desc()
+    conditions = _system_filter_conditions(filters)
+
+    with session_scope() as session:
+        total = session.execute(select(func.count(System.id)).where(*conditions)).scalar()
+
+        stmt = select(System).where(*conditions).order_by(order, System.id).offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        systems = [s.to_dict() for s in session.execute(stmt).scalars()]
+
+        return {
+            'systems': systems,
+            'total': total
+        }
+
+
+def query_systems_after(filters=None, after=None, limit=30, sort=('updated_at', 'desc')):
+    """(정렬 컬럼, id) 기준 keyset 페이지 조회
+
+    OFFSET 없이 이전 페이지 마지막 행 다음부터 읽으므로 뒤쪽 페이지도 비용이 같다.
+    sort는 query_systems와 같은 (SYSTEM_SORT_COLUMNS 키, 'asc' 또는 'desc')이며 id가 동률을 가른다.
+    after에는 같은 sort로 호출한 이전 결과의 next_cursor를 넘긴다 (첫 페이지는 None).
+
+    반환: {'systems': dict 목록, 'next_cursor': 다음 페이지 커서 (마지막 페이지면 None)}
+    """
+    column_name, direction = sort
+    column = SYSTEM_SORT_COLUMNS[column_name]
+    descending = direction == 'desc'
+    conditions = _system_filter_conditions(filters)
+    if after is not None:
+        conditions.append(_keyset_after_condition(column, after, descending))
+
+    if descending:
+        order = (column.desc(), System.id.desc())
+    else:
+        order = (column.asc(), System.id.asc())
+
+    with session_scope() as session:
+        systems = [
+            s.to_dict() for s in session.execute(
+                select(System).where(*conditions).order_by(*order).limit(limit + 1)
+            ).scalars()
+        ]
+
+    next_cursor = None
+    if len(systems) > limit:
+        systems = systems[:limit]
+        next_cursor = (systems[-1][column_name], systems[-1]['id'])
+    return {
+        'systems': systems,
+        'next_cursor': next_cursor
+    }
+
+
+def _keyset_after_condition(column, after, descending):
+    """커서 (값, id) 다음 행 조건 (SQLite는 NULL을 오름차순 맨 앞, 내림차순 맨 뒤로 정렬)"""
+    value, last_id = after
+    if value is None:
+        if descending:
+            return (column.is_(None)) & (System.id < last_id)
+        return or_(column.is_not(None), (column.is_(None)) & (System.id > last_id))
+
+    key = tuple_(column, System.id)
+    if descending:
+        return or_(key < tuple_(value, last_id), column.is_(None))
+    return key > tuple_(value, last_id)
+
+
+def count_systems_by_status(filters=None):
+    """필터 조건에 맞는 상태별 시스템 수 (GROUP BY 한 번)"""
+    with session_scope() as session:
+        rows = session.execute(
+            select(System.status, func.count(System.id))
+            .where(*_system_filter_conditions(filters))
+            .group_by(System.status)
+        ).all()
+    return dict(rows)
+
+
+# 패싯 이름 -> (집계 컬럼, 해당 패싯이 사용하는 필터 키)
+FILTER_FACETS = {
+    'statuses': (System.status, 'statuses'),
+    'frontend_platforms': (System.frontend_platform, 'frontend_platform'),
+    'backend_platforms': (System.backend_platform, 'backend_platform'),
+    'owners': (System.owner, 'owners')
+}
+
+
+def get_filter_facets(filters=None):
+    """목록 필터 선택지와 선택지별 시스템 수를 한 번의 조회로 반환
+
+    각 패싯의 수는 자기 자신을 제외한 나머지 필터를 적용한 결과라서
+    이미 고른 값 외의 다른 선택지도 계속 표시된다.
+
+    반환: {'departments': {부서: 수}, 'statuses': {...}, 'frontend_platforms': {...},
+           'backend_platforms': {...}, 'owners': {...}} (각 dict는 값 이름순)
+    """
+    filters = filters or {}
+
+    def without(key):
+        return {k: v for k, v in filters.items() if k != key}
+
+    queries = [
+        select(literal('departments').label('facet'),
+               SystemDepartment.department.label('value'),
+               func.count(SystemDepartment.system_id).label('count'))
+        .join(System, System.id == SystemDepartment.system_id)
+        .where(*_system_filter_conditions(without('departments')))
+        .group_by(SystemDepartment.department)
+    ]
+    for facet, (column, filter_key) in FILTER_FACETS.items():
+        queries.append(
+            select(literal(facet).label('facet'), column.label('value'), func.count(System.id).label('count'))
+            .where(*_system_filter_conditions(without(filter_key)), column.isnot(None), column != '')
+            .group_by(column)
+        )
+
+    facets = {'departments': {}, **{facet: {} for facet in FILTER_FACETS}}
+    with session_scope() as session:
+        rows = session.execute(union_all(*queries).order_by('facet', 'value')).all()
+    for facet, value, count in rows:
+        facets[facet][value] = count
+    return facets
+
+
+# ============== 대량 Import ==============
+
+IMPORT_CHUNK_SIZE = 500
+
+
+def bulk_upsert_systems(rows, strategy='덮어쓰기', changed_by='', chunk_size=IMPORT_CHUNK_SIZE):
+    """여러 시스템을 청크 단위 트랜잭션으로 일괄 생성/수정
+
+    rows는 (행 번호, 데이터 dict) 목록이며, 중복 시스템명은 strategy
+    ('덮어쓰기'/'건너뛰기'/'새로 추가')에 따라 처리한다.
+    반환값은 import_from_excel과 같은 success/failed/skipped/errors dict.
+    이미 열린 session_scope 안에서 호출하면 모든 청크가 그 트랜잭션 하나로 반영된다.
+    """
+    result = {
+        'success': 0,
+        'failed': 0,
+        'skipped': 0,
+        'errors': []
+    }
+
+    ensure_daily_snapshot()
+    rows = list(rows)
+    names = list({data['system_name'] for _, data in rows})
+    existing = {}
+    with session_scope() as session:
+        for i in range(0, len(names), chunk_size):
+            existing.update(session.execute(
+                select(System.system_name, System.id)
+                .where(System.system_name.in_(names[i:i + chunk_size]))
+            ).all())
+
+    chunk = []
+    chunk_names = set()
+    for row_no, data in rows:
+        name = data['system_name']
+
+        # 같은 파일 안의 중복 이름은 앞선 행이 반영된 뒤 처리
+        if name in chunk_names:
+            _flush_import_chunk(chunk, existing, changed_by, result)
+            chunk, chunk_names = [], set()
+
+        if name in existing:
+            if strategy == '건너뛰기':
+                result['skipped'] += 1
+                continue
+            if strategy == '새로 추가':
+                data = dict(data, system_name=f"{name} ({row_no})")
+
+        chunk.append((row_no, data))
+        chunk_names.add(data['system_name'])
+        if len(chunk) >= chunk_size:
+            _flush_import_chunk(chunk, existing, changed_by, result)
+            chunk, chunk_names = [], set()
+
+    _flush_import_chunk(chunk, existing, changed_by, result)
+    return result
+
+
+def _flush_import_chunk(chunk, existing, changed_by, result):
+    """청크를 하나의 트랜잭션으로 반영 (실패 시 행마다 SAVEPOINT로 재시도해 실패 행만 보고)"""
+    if not chunk:
+        return
+
+    with session_scope() as session:
+        try:
+            with session.begin_nested():
+                created = _apply_import_rows(session, chunk, existing, changed_by)
+            existing.update(created)
+            result['success'] += len(chunk)
+            return
+        except Exception:
+            pass
+
+        for row_no, data in chunk:
+            try:
+                with session.begin_nested():
+                    created = _apply_import_rows(session, [(row_no, data)], existing, changed_by)
+                existing.update(created)
+                result['success'] += 1
+            except Exception as e:
+                result['errors'].append(f"행 {row_no}: {str(e)}")
+                result['failed'] += 1
+
+
+def _apply_import_rows(session, chunk, existing, changed_by):
+    """INSERT/UPDATE/이력을 executemany로 실행하고 새로 생성된 {이름: id} 반환"""
+    now = datetime.now()
+    columns = set(System.__table__.columns.keys())
+    updates = [(row_no, data) for row_no, data in chunk if data['system_name'] in existing]
+    inserts = [(row_no, data) for row_no, data in chunk if data['system_name'] not in existing]
+    history = []
+    departments_by_id = {}
+    stats_delta = {}
+
+    if updates:
+        ids = [existing[data['system_name']] for _, data in updates]
+        current = {
+            row['id']: row
+            for row in session.execute(select(System.__table__).where(System.id.in_(ids))).mappings()
+        }
+
+        params = []
+        for system_id, (_, data) in zip(ids, updates):
+            values = {k: v for k, v in data.items() if k in columns and k != 'id'}
+            old = current[system_id]
+            for key, new_value in values.items():
+                if old[key] != new_value:
+                    history.append({
+                        'system_id': system_id,
+                        'field_name': key,
+                        'old_value': str(old[key]) if old[key] is not None else '',
+                        'new_value': str(new_value) if new_value is not None else '',
+                        'old_data': _to_json_value(old[key]),
+                        'new_data': _to_json_value(new_value),
+                        'changed_by': changed_by,
+                        'changed_at': now,
+                        'comment': ''
+                    })
+            params.append(dict(values, id=system_id, updated_at=now))
+            _add_dashboard_delta(stats_delta, old, dict(old, **values))
+            if 'departments' in values:
+                departments_by_id[system_id] = None if old['is_deleted'] else values['departments']
+        session.execute(update(System), params)
+
+    created = {}
+    if inserts:
+        params = []
+        for _, data in inserts:
+            values = {k: v for k, v in data.items() if k in columns and k != 'id'}
+            values.setdefault('description', '')
+            values.setdefault('departments', [])
+            values.setdefault('progress', 0.0)
+            values.setdefault('status', '개발 중')
+            values.setdefault('created_by', changed_by)
+            values.setdefault('created_at', now)
+            params.append(values)
+            _add_dashboard_delta(stats_delta, None, values)
+        session.execute(insert(System), params)
+
+        names = [data['system_name'] for _, data in inserts]
+        created = dict(session.execute(
+            select(System.system_name, System.id).where(System.system_name.in_(names))
+        ).all())
+        for values in params:
+            departments_by_id[created[values['system_name']]] = values['departments']
+        history.extend({
+            'system_id': created[name],
+            'field_name': 'created',
+            'old_value': '',
+            'new_value': '시스템 생성',
+            'changed_by': changed_by,
+            'changed_at': now,
+            'comment': ''
+        } for name in names)
+
+    if history:
+        session.execute(insert(SystemHistory), history)
+    _replace_system_departments(session, departments_by_id)
+    _apply_dashboard_delta(session, stats_delta)
+    _take_system_snapshots(session, list(created.values()), force=True)
+    if updates:
+        _take_system_snapshots(session, [existing[data['system_name']] for _, data in updates])
+    bump_data_versions(session, {System.__tablename__, SystemHistory.__tablename__})
+
+    return created
+
+
+def get_import_checkpoint(import_key):
+    """가져오기 재개 지점 조회"""
+    with session_scope() as session:
+        checkpoint = session.query(ImportCheckpoint)\
+            .filter(ImportCheckpoint.import_key == import_key).first()
+        return checkpoint.to_dict() if checkpoint else None
+
+
+def save_import_checkpoint(import_key, rows_done, result, file_name=None):
+    """커밋이 끝난 행 수와 누적 결과를 재개 지점으로 저장"""
+    with session_scope() as session:
+        checkpoint = session.query(ImportCheckpoint)\
+            .filter(ImportCheckpoint.import_key == import_key).first()
+        if checkpoint is None:
+            checkpoint = ImportCheckpoint(import_key=import_key, file_name=file_name)
+            session.add(checkpoint)
+        checkpoint.rows_done = rows_done
+        checkpoint.result = dict(result, errors=list(result['errors']))
+        checkpoint.updated_at = datetime.now()
+
+
+def clear_import_checkpoint(import_key):
+    """가져오기 재개 지점 삭제"""
+    with session_scope() as session:
+        session.query(ImportCheckpoint)\
+            .filter(ImportCheckpoint.import_key == import_key).delete()
+
+
+# ============== 일별 진행 스냅샷 ==============
+
+# 이 프로세스에서 일별 스냅샷을 확인한 마지막 날짜 (같은 날 반복 조회 방지)
+_daily_snapshot_day = None
+
+
+def ensure_daily_snapshot():
+    """오늘 일별 스냅샷이 없으면 현재 진행률/상태로 기록
+
+    그날 첫 조회 또는 첫 변경 직전에 호출되므로 스냅샷은 그날 시작 시점 상태가 된다.
+    변경 트랜잭션과 분리된 별도 트랜잭션으로 기록한다.
+    여러 세션/프로세스가 동시에 호출해도 이미 기록된 행은 건너뛴다 (INSERT OR IGNORE).
+    """
+    global _daily_snapshot_day
+    today = date.today()
+    if _daily_snapshot_day == today:
+        return
+
+    with session_scope() as session:
+        # 빠른 경로: 다른 프로세스가 이미 오늘 스냅샷을 기록했으면 쓰기 트랜잭션을 열지 않음
+        exists = session.execute(
+            select(DailySystemSnapshot.day).where(DailySystemSnapshot.day == today).limit(1)
+        ).first()
+        if exists is None:
+            inserted = session.execute(
+                sqlite_insert(DailySystemSnapshot).from_select(
+                    ['day', 'system_id', 'progress', 'status'],
+                    select(literal(today, Date), System.id, System.progress, System.status)
+                    .where(System.is_deleted == False)
+                ).on_conflict_do_nothing(index_elements=['day', 'system_id'])
+            )
+            if inserted.rowcount:
+                bump_data_versions(session, {DailySystemSnapshot.__tablename__})
+    _daily_snapshot_day = today
+
+
+def get_daily_snapshots(since=None):
+    """일별 스냅샷 행 (day, system_id, progress, status) 목록, 날짜/시스템 순
+
+    스냅샷은 조회나 변경이 있던 날에만 있으며, 없는 날은 직전 스냅샷 상태가 이어진 것으로 본다.
+    """
+    ensure_daily_snapshot()
+    stmt = select(
+        DailySystemSnapshot.day, DailySystemSnapshot.system_id,
+        DailySystemSnapshot.progress, DailySystemSnapshot.status
+    )
+    if since is not None:
+        stmt = stmt.where(DailySystemSnapshot.day >= since)
+    with session_scope() as session:
+        return session.execute(stmt.order_by(DailySystemSnapshot.day, DailySystemSnapshot.system_id)).all()
 
 
 # ============== 서비스 CRUD ==============
 
 def get_all_services():
     """모든 서비스 조회"""
-    session = get_session()
-    try:
+    with session_scope() as session:
         services = session.query(Service).order_by(Service.monthly_cost.desc()).all()
         return [s.to_dict() for s in services]
-    finally:
-        session.close()
 
 
 def create_service(data):
     """서비스 생성"""
-    session = get_session()
-    try:
+    with session_scope() as session:
         service = Service(
             service_name=data.get('service_name'),
             plan_type=data.get('plan_type'),
@@ -183,62 +785,230 @@ def create_service(data):
             notes=data.get('notes')
         )
         session.add(service)
-        session.commit()
+        session.flush()
+        _record_service_cost(session, service, 'created', 0.0)
         return service.id
-    finally:
-        session.close()
 
 
 def update_service(service_id, data):
     """서비스 수정"""
-    session = get_session()
-    try:
+    with session_scope() as session:
         service = session.query(Service).filter(Service.id == service_id).first()
         if service:
+            previous_cost = service.monthly_cost or 0.0
             for key, value in data.items():
                 if hasattr(service, key):
                     setattr(service, key, value)
             service.updated_at = datetime.now()
-            session.commit()
+            if (service.monthly_cost or 0.0) != previous_cost:
+                _record_service_cost(session, service, 'updated', previous_cost)
             return True
         return False
-    finally:
-        session.close()
 
 
 def delete_service(service_id):
     """서비스 삭제"""
-    session = get_session()
-    try:
+    with session_scope() as session:
         service = session.query(Service).filter(Service.id == service_id).first()
         if service:
+            _record_service_cost(session, service, 'deleted', service.monthly_cost or 0.0)
             session.delete(service)
-            session.commit()
             return True
         return False
-    finally:
-        session.close()
+
+
+# ============== 서비스 비용 추이 ==============
+
+def _apply_cost_rollup(connection, month, cost_change):
+    """service_cost_monthly에 해당 월 순변화량을 더함"""
+    if not cost_change:
+        return
+    stmt = sqlite_insert(ServiceCostMonthly).values(month=month, cost_change=cost_change)
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[ServiceCostMonthly.month],
+        set_={'cost_change': ServiceCostMonthly.cost_change + stmt.excluded.cost_change}
+    ))
+
+
+def _record_service_cost(session, service, change_type, previous_cost):
+    """비용 변경 기록과 월별 롤업을 같은 트랜잭션에서 갱신"""
+    now = datetime.now()
+    monthly_cost = 0.0 if change_type == 'deleted' else (service.monthly_cost or 0.0)
+    session.add(ServiceCostSnapshot(
+        service_id=service.id,
+        service_name=service.service_name,
+        event=change_type,
+        monthly_cost=monthly_cost,
+        previous_cost=previous_cost,
+        currency=service.currency,
+        changed_at=now
+    ))
+    _apply_cost_rollup(session, now.strftime('%Y-%m'), monthly_cost - previous_cost)
+
+
+def _month_range(first_month, last_month):
+    """'YYYY-MM' 두 값 사이(양 끝 포함)의 월 목록"""
+    year, month = map(int, first_month.split('-'))
+    months = []
+    while f"{year:04d}-{month:02d}" <= last_month:
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def get_monthly_costs(months=12):
+    """월별 비용 추이 (각 월 말 기준 전체 서비스 월 비용 합계, 최근 months개월)
+
+    월별 롤업의 누적합이므로 비용 변경 기록 수와 관계없이 월 수만큼만 읽는다.
+    반환: [{'month': 'YYYY-MM', 'value': 합계}] (utils.charts.create_monthly_trend 입력 형식)
+    """
+    with session_scope() as session:
+        rows = session.execute(
+            select(ServiceCostMonthly.month, ServiceCostMonthly.cost_change).order_by(ServiceCostMonthly.month)
+        ).all()
+    if not rows:
+        return []
+
+    changes = dict(rows)
+    current_month = datetime.now().strftime('%Y-%m')
+    total = 0.0
+    series = []
+    for month in _month_range(rows[0].month, max(current_month, rows[-1].month)):
+        total += changes.get(month, 0.0)
+        series.append({'month': month, 'value': round(total, 2)})
+    return series[-months:] if months else series
 
 
 # ============== 이력 관리 ==============
 
 def get_system_history(system_id):
-    """시스템 변경 이력 조회"""
-    session = get_session()
-    try:
+    """시스템 변경 이력 조회 (보관된 이력 포함, 최신순)"""
+    with session_scope() as session:
         history = session.query(SystemHistory)\
             .filter(SystemHistory.system_id == system_id)\
             .order_by(SystemHistory.changed_at.desc())\
             .all()
-        return [h.to_dict() for h in history]
-    finally:
-        session.close()
+        history = [h.to_dict() for h in history]
+        history.extend(_iter_archived_history(session, system_id))
+    return sorted(history, key=_history_sort_key, reverse=True)
+
+
+def _history_filter_conditions(system_id, filters):
+    """이력 필터 dict를 SQL 조건 목록으로 변환
+
+    filters 키 (모두 선택):
+        field_names: 필드명 목록, changed_by: 변경자 목록,
+        date_from / date_to: 변경일 범위 (date, 양 끝 포함)
+    """
+    filters = filters or {}
+    conditions = [SystemHistory.system_id == system_id]
+
+    if filters.get('field_names'):
+        conditions.append(SystemHistory.field_name.in_(filters['field_names']))
+
+    if filters.get('changed_by'):
+        conditions.append(SystemHistory.changed_by.in_(filters['changed_by']))
+
+    if filters.get('date_from'):
+        conditions.append(SystemHistory.changed_at >= datetime.combine(filters['date_from'], datetime.min.time()))
+
+    if filters.get('date_to'):
+        conditions.append(SystemHistory.changed_at < datetime.combine(filters['date_to'] + timedelta(days=1), datetime.min.time()))
+
+    return conditions
+
+
+def get_system_history_page(system_id, filters=None, before=None, limit=50):
+    """시스템 변경 이력을 최신순 keyset 페이지로 조회
+
+    (changed_at, id) 인덱스를 따라 이전 페이지 마지막 행 다음부터 읽는다.
+    before에는 이전 호출의 next_cursor를 넘긴다 (첫 페이지는 None).
+    보관된 이력도 같은 순서로 이어지며, 필요한 묶음만 압축을 푼다.
+
+    반환: {'history': dict 목록, 'next_cursor': 다음 페이지 커서 (마지막 페이지면 None)}
+    """
+    conditions = _history_filter_conditions(system_id, filters)
+    if before is not None:
+        conditions.append(tuple_(SystemHistory.changed_at, SystemHistory.id) < tuple_(*before))
+
+    with session_scope() as session:
+        history = [
+            h.to_dict() for h in session.execute(
+                select(SystemHistory)
+                .where(*conditions)
+                .order_by(SystemHistory.changed_at.desc(), SystemHistory.id.desc())
+                .limit(limit + 1)
+            ).scalars()
+        ]
+
+        # 현재 테이블에서 한 페이지를 채웠으면 그보다 새로운 보관 묶음만 확인
+        newer_than = history[-1]['changed_at'] if len(history) > limit else None
+        archived = list(islice(
+            _iter_archived_history(session, system_id, filters, before=before, newer_than=newer_than),
+            limit + 1
+        ))
+    if archived:
+        history = sorted(history + archived, key=_history_sort_key, reverse=True)[:limit + 1]
+
+    next_cursor = None
+    if len(history) > limit:
+        history = history[:limit]
+        next_cursor = (history[-1]['changed_at'], history[-1]['id'])
+    return {
+        'history': history,
+        'next_cursor': next_cursor
+    }
+
+
+def count_system_history(system_id, filters=None):
+    """필터 조건에 맞는 변경 이력 수 (보관된 이력 포함)"""
+    with session_scope() as session:
+        count = session.execute(
+            select(func.count(SystemHistory.id)).where(*_history_filter_conditions(system_id, filters))
+        ).scalar()
+
+        if any((filters or {}).values()):
+            count += sum(1 for _ in _iter_archived_history(session, system_id, filters))
+        else:
+            count += session.execute(
+                select(func.coalesce(func.sum(SystemHistoryArchive.row_count), 0))
+                .where(SystemHistoryArchive.system_id == system_id)
+            ).scalar()
+        return count
+
+
+def get_history_filter_options(system_id):
+    """이력 필터 선택지 (해당 시스템 이력에 나온 필드명/변경자)"""
+    with session_scope() as session:
+        fields = session.execute(
+            select(SystemHistory.field_name.distinct())
+            .where(SystemHistory.system_id == system_id, SystemHistory.field_name.isnot(None))
+            .order_by(SystemHistory.field_name)
+        ).scalars().all()
+        users = session.execute(
+            select(SystemHistory.changed_by.distinct())
+            .where(SystemHistory.system_id == system_id, SystemHistory.changed_by.isnot(None),
+                   SystemHistory.changed_by != '')
+            .order_by(SystemHistory.changed_by)
+        ).scalars().all()
+        batches = session.execute(
+            select(SystemHistoryArchive.field_names, SystemHistoryArchive.changed_by)
+            .where(SystemHistoryArchive.system_id == system_id)
+        ).all()
+
+    fields, users = set(fields), set(users)
+    for batch_fields, batch_users in batches:
+        fields.update(batch_fields or [])
+        users.update(u for u in batch_users or [] if u)
+    return {
+        'field_names': sorted(fields),
+        'changed_by': sorted(users)
+    }
 
 
 def record_history(system_id, field_name, old_value, new_value, changed_by='', comment=''):
-    """변경 이력 기록"""
-    session = get_session()
-    try:
+    """변경 이력 기록 (열린 session_scope가 있으면 같은 트랜잭션에 포함)"""
+    with session_scope() as session:
         history = SystemHistory(
             system_id=system_id,
             field_name=field_name,
@@ -248,51 +1018,868 @@ def record_history(system_id, field_name, old_value, new_value, changed_by='', c
             comment=comment
         )
         session.add(history)
-        session.commit()
-    finally:
-        session.close()
+
+
+# 이력 대상에서 제외할 컬럼 (삭제는 delete_system에서 별도 기록)
+_UNTRACKED_SYSTEM_FIELDS = {'id', 'created_at', 'updated_at', 'is_deleted'}
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_system_changes(session, flush_context, instances):
+    """수정된 System의 필드별 변경 이력을 같은 flush에 포함"""
+    changed_by = session.info.get('changed_by', '')
+    for obj in list(session.dirty):
+        if not isinstance(obj, System):
+            continue
+
+        state = inspect(obj)
+        for attr in state.mapper.column_attrs:
+            if attr.key in _UNTRACKED_SYSTEM_FIELDS:
+                continue
+            history = state.attrs[attr.key].history
+            if not history.has_changes():
+                continue
+
+            old_value = history.deleted[0] if history.deleted else None
+            new_value = history.added[0] if history.added else None
+            if old_value == new_value:
+                continue
+
+            session.add(SystemHistory(
+                system_id=obj.id,
+                field_name=attr.key,
+                old_value=str(old_value) if old_value is not None else '',
+                new_value=str(new_value) if new_value is not None else '',
+                old_data=_to_json_value(old_value),
+                new_data=_to_json_value(new_value),
+                changed_by=changed_by,
+                comment=''
+            ))
+
+
+# ============== 이력 보관/압축 ==============
+
+# 보관 묶음 하나에 넣는 최대 이력 행 수 (페이지 조회 시 압축 해제 단위)
+HISTORY_ARCHIVE_BATCH_ROWS = 1000
+
+# 값 비교 없이 그대로 보관하는 생성/삭제 이력
+_LIFECYCLE_HISTORY_FIELDS = {'created', 'deleted'}
+
+# 같은 필드 연속 변경을 병합하는 최대 시간 간격 (병합된 중간 상태는 시점 복원에서 사라진다)
+HISTORY_MERGE_WINDOW = timedelta(minutes=10)
+
+
+def _history_sort_key(row):
+    return (row['changed_at'] or datetime.min, row['id'])
+
+
+def _encode_history_batch(rows):
+    """이력 dict 목록 -> zlib 압축 JSON"""
+    def default(value):
+        if isinstance(value, datetime):
+            return {'$datetime': value.isoformat()}
+        raise TypeError(f"직렬화할 수 없는 값: {value!r}")
+
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, default=default).encode('utf-8'))
+
+
+def _decode_history_batch(payload):
+    def object_hook(obj):
+        if '$datetime' in obj:
+            return datetime.fromisoformat(obj['$datetime'])
+        return obj
+
+    return json.loads(zlib.decompress(payload).decode('utf-8'), object_hook=object_hook)
+
+
+def _history_row_matches(row, filters):
+    """_history_filter_conditions와 같은 조건을 보관된 이력 dict에 적용"""
+    if filters.get('field_names') and row['field_name'] not in filters['field_names']:
+        return False
+    if filters.get('changed_by') and row['changed_by'] not in filters['changed_by']:
+        return False
+    changed_date = row['changed_at'].date() if row['changed_at'] else None
+    if filters.get('date_from') and (changed_date is None or changed_date < filters['date_from']):
+        return False
+    if filters.get('date_to') and (changed_date is None or changed_date > filters['date_to']):
+        return False
+    return True
+
+
+def _iter_archived_history(session, system_id, filters=None, before=None, newer_than=None):
+    """보관된 이력을 최신순으로 생성 (묶음 단위로 필요할 때만 압축 해제)
+
+    before: 이 (changed_at, id)보다 오래된 행만, newer_than: 마지막 변경이 이 시각 이후인 묶음만.
+    보관 기준 시각은 실행마다 앞으로만 이동하므로 묶음끼리 기간이 겹치지 않는다.
+    """
+    filters = filters or {}
+    stmt = select(SystemHistoryArchive.payload).where(SystemHistoryArchive.system_id == system_id)
+    if before is not None:
+        stmt = stmt.where(SystemHistoryArchive.first_changed_at <= before[0])
+    if newer_than is not None:
+        stmt = stmt.where(SystemHistoryArchive.last_changed_at >= newer_than)
+    if filters.get('date_from'):
+        stmt = stmt.where(SystemHistoryArchive.last_changed_at >= datetime.combine(filters['date_from'], datetime.min.time()))
+    if filters.get('date_to'):
+        stmt = stmt.where(SystemHistoryArchive.first_changed_at < datetime.combine(filters['date_to'] + timedelta(days=1), datetime.min.time()))
+    stmt = stmt.order_by(SystemHistoryArchive.last_changed_at.desc(), SystemHistoryArchive.id.desc())
+
+    for payload in session.execute(stmt.execution_options(yield_per=8)).scalars():
+        rows = sorted(_decode_history_batch(payload), key=_history_sort_key, reverse=True)
+        for row in rows:
+            if before is not None and _history_sort_key(row) >= tuple(before):
+                continue
+            if _history_row_matches(row, filters):
+                yield row
+
+
+def _history_row_is_noop(row):
+    """이전 값과 새 값이 같은 변경인지 (시스템 컬럼은 타입 값으로 비교)"""
+    field = row['field_name']
+    if field in System.__table__.c and field not in _UNTRACKED_SYSTEM_FIELDS:
+        return _history_value(row, 'old') == _history_value(row, 'new')
+    return row['old_value'] == row['new_value']
+
+
+def _crosses_snapshot(previous, row, snapshots):
+    """두 이력 사이에 스냅샷이 있는지 (snapshots: [(history_id, taken_at), ...])"""
+    for history_id, taken_at in snapshots:
+        if previous['id'] <= history_id < row['id']:
+            return True
+        if (taken_at is not None and previous['changed_at'] is not None and row['changed_at'] is not None
+                and previous['changed_at'] <= taken_at < row['changed_at']):
+            return True
+    return False
+
+
+def _compact_history_rows(rows, snapshots=()):
+    """오래된 순 이력 dict 목록에서 의미 없는 변경을 정리
+
+    - 이전 값과 새 값이 같은 변경(no-op)은 제거
+    - 같은 필드를 같은 사용자가 HISTORY_MERGE_WINDOW 안에 연달아 바꾼 변경은
+      처음 이전 값 -> 마지막 새 값 한 건으로 병합 (병합 결과가 원래 값으로 돌아왔다면 제거)
+    - 사이에 스냅샷이 있는 변경끼리는 병합하지 않는다 (스냅샷 상태와 이력이 어긋나지 않도록)
+
+    snapshots: 이 시스템의 [(history_id, taken_at), ...]
+    반환: (정리된 목록, 병합된 행 수, 제거된 no-op 행 수)
+    """
+    compacted = []
+    last_by_field = {}  # 필드명 -> (compacted 안의 같은 필드 마지막 변경 위치, 병합 시작 시각)
+    merged = dropped = 0
+
+    for row in rows:
+        field = row['field_name']
+        if field in _LIFECYCLE_HISTORY_FIELDS:
+            compacted.append(row)
+            continue
+
+        if _history_row_is_noop(row):
+            dropped += 1
+            continue
+
+        previous_index, started_at = last_by_field.get(field, (None, None))
+        previous = compacted[previous_index] if previous_index is not None else None
+        if (previous is not None and previous['changed_by'] == row['changed_by']
+                and not previous['comment'] and not row['comment']
+                and started_at is not None and row['changed_at'] is not None
+                and row['changed_at'] - started_at <= HISTORY_MERGE_WINDOW
+                and not _crosses_snapshot(previous, row, snapshots)):
+            # 최신 행 기준으로 이전 값(문자열/타입 값)만 첫 변경의 것으로 유지
+            compacted[previous_index] = {
+                **row, 'old_value': previous['old_value'], 'old_data': previous.get('old_data')
+            }
+            merged += 1
+            continue
+
+        last_by_field[field] = (len(compacted), row['changed_at'])
+        compacted.append(row)
+
+    result = [
+        row for row in compacted
+        if row['field_name'] in _LIFECYCLE_HISTORY_FIELDS or not _history_row_is_noop(row)
+    ]
+    dropped += len(compacted) - len(result)
+    # 병합된 행은 마지막 변경 시각을 가지므로 다시 시간순 정렬
+    result.sort(key=_history_sort_key)
+    return result, merged, dropped
+
+
+def compact_history(older_than_days=None, batch_rows=HISTORY_ARCHIVE_BATCH_ROWS):
+    """오래된 변경 이력을 정리해 압축 보관 테이블로 이동
+
+    시스템마다 짧은 트랜잭션 하나로 처리하므로 실행 중에도 다른 쓰기가 오래 기다리지 않는다.
+    보관된 이력은 get_system_history(), get_system_history_page() 등에서 그대로 조회된다.
+
+    반환: {'systems': 처리한 시스템 수, 'archived': 보관된 행 수,
+           'merged': 병합된 행 수, 'dropped': 제거된 no-op 행 수}
+    """
+    days = HISTORY_ARCHIVE_DAYS if older_than_days is None else older_than_days
+    cutoff = datetime.now() - timedelta(days=days)
+    result = {'systems': 0, 'archived': 0, 'merged': 0, 'dropped': 0}
+
+    with session_scope() as session:
+        system_ids = session.execute(
+            select(SystemHistory.system_id.distinct()).where(SystemHistory.changed_at < cutoff)
+        ).scalars().all()
+
+    for system_id in system_ids:
+        with session_scope() as session:
+            rows = [
+                h.to_dict() for h in session.execute(
+                    select(SystemHistory)
+                    .where(SystemHistory.system_id == system_id, SystemHistory.changed_at < cutoff)
+                    .order_by(SystemHistory.changed_at, SystemHistory.id)
+                ).scalars()
+            ]
+            if not rows:
+                continue
+
+            snapshots = session.execute(
+                select(SystemSnapshot.history_id, SystemSnapshot.taken_at)
+                .where(SystemSnapshot.system_id == system_id)
+            ).all()
+            kept, merged, dropped = _compact_history_rows(rows, snapshots)
+            for i in range(0, len(kept), batch_rows):
+                batch = kept[i:i + batch_rows]
+                session.add(SystemHistoryArchive(
+                    system_id=system_id,
+                    first_changed_at=batch[0]['changed_at'],
+                    last_changed_at=batch[-1]['changed_at'],
+                    row_count=len(batch),
+                    field_names=sorted({r['field_name'] for r in batch if r['field_name']}),
+                    changed_by=sorted({r['changed_by'] for r in batch if r['changed_by']}),
+                    payload=_encode_history_batch(batch)
+                ))
+
+            ids = [r['id'] for r in rows]
+            for i in range(0, len(ids), IMPORT_CHUNK_SIZE):
+                session.execute(delete(SystemHistory).where(SystemHistory.id.in_(ids[i:i + IMPORT_CHUNK_SIZE])))
+            bump_data_versions(session, {'system_history'})
+
+        result['systems'] += 1
+        result['archived'] += len(kept)
+        result['merged'] += merged
+        result['dropped'] += dropped
+
+    return result
+
+
+# ============== 시점 복원 (스냅샷) ==============
+
+# 마지막 스냅샷 이후 이력이 이만큼 쌓이면 새 스냅샷을 남긴다 (시점 복원 시 재생할 최대 변경 수)
+SNAPSHOT_INTERVAL = 50
+
+
+def _to_json_value(value):
+    """JSON 컬럼에 넣을 수 있는 값으로 변환 (날짜/시각은 ISO 문자열)"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _restore_column_value(column, value):
+    """JSON 값(스냅샷/타입 이력)을 컬럼 타입의 Python 값으로 복원"""
+    if value is None or not isinstance(value, str):
+        return value
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def _parse_history_text(column, text_value):
+    """이전 버전 이력의 문자열 값(str(값), None은 '')을 컬럼 타입의 Python 값으로 변환"""
+    if text_value is None or text_value == '':
+        return None if column.nullable else text_value
+    try:
+        if isinstance(column.type, Boolean):
+            return text_value == 'True'
+        if isinstance(column.type, Float):
+            return float(text_value)
+        if isinstance(column.type, Integer):
+            return int(text_value)
+        if isinstance(column.type, JSON):
+            return ast.literal_eval(text_value)
+        if isinstance(column.type, DateTime):
+            return datetime.fromisoformat(text_value)
+        if isinstance(column.type, Date):
+            return date.fromisoformat(text_value)
+    except (ValueError, SyntaxError):
+        pass
+    return text_value
+
+
+def _history_value(row, side):
+    """이력 행의 이전('old')/새('new') 값을 JSON 값으로 (타입 값이 없으면 문자열에서 변환)"""
+    column = System.__table__.c[row['field_name']]
+    typed = row.get(f'{side}_data')
+    if typed is not None:
+        return typed
+    return _to_json_value(_parse_history_text(column, row[f'{side}_value']))
+
+
+def _apply_history_to_state(state, row):
+    """스냅샷 state(JSON 값)에 이력 한 건을 적용 (시간 순방향)"""
+    field = row['field_name']
+    if field == 'deleted':
+        state['is_deleted'] = True
+    elif field in System.__table__.c and field not in _UNTRACKED_SYSTEM_FIELDS:
+        state[field] = _history_value(row, 'new')
+    else:
+        return
+    if row['changed_at'] is not None:
+        state['updated_at'] = _to_json_value(row['changed_at'])
+
+
+def _undo_history_on_state(state, row, deleted_before=False):
+    """이력 한 건을 되돌림 (시간 역방향), 생성 이력이면 False
+
+    삭제는 여러 번 기록될 수 있으므로 deleted_before(더 오래된 삭제 이력 존재 여부)로 되돌린다.
+    """
+    field = row['field_name']
+    if field == 'created':
+        return False
+    if field == 'deleted':
+        state['is_deleted'] = deleted_before
+    elif field in System.__table__.c and field not in _UNTRACKED_SYSTEM_FIELDS:
+        state[field] = _history_value(row, 'old')
+    return True
+
+
+def _take_system_snapshots(connection, system_ids, force=False):
+    """시스템 현재 상태 스냅샷 기록
+
+    force가 아니면 마지막 스냅샷 이후 이력이 SNAPSHOT_INTERVAL건 이상 쌓인 시스템만 기록한다.
+    """
+    now = datetime.now()
+    for i in range(0, len(system_ids), IMPORT_CHUNK_SIZE):
+        ids = system_ids[i:i + IMPORT_CHUNK_SIZE]
+
+        last_snapshot = (
+            select(SystemSnapshot.system_id, func.max(SystemSnapshot.history_id).label('history_id'))
+            .where(SystemSnapshot.system_id.in_(ids))
+            .group_by(SystemSnapshot.system_id)
+            .subquery()
+        )
+        stmt = (
+            select(SystemHistory.system_id, func.max(SystemHistory.id), func.count(SystemHistory.id))
+            .outerjoin(last_snapshot, last_snapshot.c.system_id == SystemHistory.system_id)
+            .where(SystemHistory.system_id.in_(ids),
+                   SystemHistory.id > func.coalesce(last_snapshot.c.history_id, 0))
+            .group_by(SystemHistory.system_id)
+        )
+        if not force:
+            stmt = stmt.having(func.count(SystemHistory.id) >= SNAPSHOT_INTERVAL)
+        history_ids = {system_id: max_id for system_id, max_id, _ in connection.execute(stmt)}
+        due = ids if force else list(history_ids)
+        if not due:
+            continue
+
+        rows = connection.execute(select(System.__table__).where(System.id.in_(due))).mappings()
+        connection.execute(insert(SystemSnapshot), [
+            {
+                'system_id': row['id'],
+                'history_id': history_ids.get(row['id'], 0),
+                'taken_at': now,
+                'state': {key: _to_json_value(value) for key, value in row.items()}
+            }
+            for row in rows
+        ])
+
+
+def get_systems_as_of(as_of, include_deleted=False):
+    """특정 시점의 get_all_systems() 결과 복원
+
+    시스템마다 as_of 이전의 가장 가까운 스냅샷에서 출발해 그 뒤의 이력만 재생하므로
+    시스템당 재생량이 SNAPSHOT_INTERVAL 정도로 제한된다 (보관된 이력 포함).
+    이력 테이블에서는 (시스템, 필드)별 마지막 변경만 가져온다.
+    updated_at은 마지막으로 반영된 이력의 변경 시각이다.
+    """
+    if isinstance(as_of, date) and not isinstance(as_of, datetime):
+        as_of = datetime.combine(as_of, datetime.max.time())
+
+    with session_scope() as session:
+        ranked = (
+            select(
+                SystemSnapshot.system_id, SystemSnapshot.history_id, SystemSnapshot.taken_at, SystemSnapshot.state,
+                func.row_number().over(
+                    partition_by=SystemSnapshot.system_id,
+                    order_by=(SystemSnapshot.taken_at.desc(), SystemSnapshot.history_id.desc())
+                ).label('rank')
+            )
+            .where(SystemSnapshot.taken_at <= as_of)
+            .subquery()
+        )
+        snapshots = {
+            row.system_id: row for row in session.execute(select(ranked).where(ranked.c.rank == 1))
+        }
+        if not snapshots:
+            return []
+
+        chosen = select(ranked.c.system_id, ranked.c.history_id, ranked.c.taken_at).where(ranked.c.rank == 1).subquery()
+
+        # 순방향 재생은 필드별 마지막 변경만 결과에 남으므로 (시스템, 필드)별 최신 이력만 읽는다
+        latest = (
+            select(
+                SystemHistory.id, SystemHistory.system_id, SystemHistory.field_name,
+                SystemHistory.new_value, SystemHistory.new_data, SystemHistory.changed_at,
+                func.row_number().over(
+                    partition_by=(SystemHistory.system_id, SystemHistory.field_name),
+                    order_by=SystemHistory.id.desc()
+                ).label('rank')
+            )
+            .join(chosen, chosen.c.system_id == SystemHistory.system_id)
+            .where(SystemHistory.id > chosen.c.history_id,
+                   SystemHistory.changed_at >= chosen.c.taken_at,
+                   SystemHistory.changed_at <= as_of)
+            .subquery()
+        )
+        deltas = [dict(row) for row in session.execute(select(latest).where(latest.c.rank == 1)).mappings()]
+
+        # 스냅샷 이후 구간이 이미 보관된 시스템은 해당 기간 묶음만 풀어서 재생
+        archived_batches = session.execute(
+            select(SystemHistoryArchive.payload)
+            .join(chosen, chosen.c.system_id == SystemHistoryArchive.system_id)
+            .where(SystemHistoryArchive.last_changed_at >= chosen.c.taken_at,
+                   SystemHistoryArchive.first_changed_at <= as_of)
+        ).scalars()
+        for payload in archived_batches:
+            for row in _decode_history_batch(payload):
+                snapshot = snapshots[row['system_id']]
+                if row['id'] > snapshot.history_id and row['changed_at'] and row['changed_at'] <= as_of:
+                    deltas.append(row)
+
+    states = {system_id: dict(snapshot.state) for system_id, snapshot in snapshots.items()}
+    for row in sorted(deltas, key=lambda h: h['id']):
+        _apply_history_to_state(states[row['system_id']], row)
+
+    columns = System.__table__.c
+    systems = []
+    for state in states.values():
+        system = {key: _restore_column_value(columns[key], value) for key, value in state.items() if key in columns}
+        if system.get('is_deleted') and not include_deleted:
+            continue
+        system['departments'] = system.get('departments') or []
+        systems.append({column.key: system.get(column.key) for column in columns})
+
+    systems.sort(key=lambda s: s['updated_at'] or datetime.min, reverse=True)
+    return systems
+
+
+# ============== 부서 인덱스 ==============
+
+def _replace_system_departments(connection, departments_by_id):
+    """system_departments 인덱스를 {시스템 id: 부서 목록}으로 교체 (None이면 제거)"""
+    ids = list(departments_by_id)
+    for i in range(0, len(ids), IMPORT_CHUNK_SIZE):
+        connection.execute(
+            delete(SystemDepartment).where(SystemDepartment.system_id.in_(ids[i:i + IMPORT_CHUNK_SIZE]))
+        )
+
+    rows = [
+        {'system_id': system_id, 'department': department}
+        for system_id, departments in departments_by_id.items()
+        for department in dict.fromkeys(departments or [])
+        if department
+    ]
+    if rows:
+        connection.execute(insert(SystemDepartment), rows)
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_system_departments(session, flush_context):
+    """생성/부서 변경/삭제된 System의 부서 인덱스를 같은 트랜잭션에서 갱신"""
+    departments_by_id = {}
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, System):
+            continue
+        state = inspect(obj)
+        if obj in session.new or \
+                state.attrs.departments.history.has_changes() or \
+                state.attrs.is_deleted.history.has_changes():
+            departments_by_id[obj.id] = None if obj.is_deleted else obj.departments
+
+    if departments_by_id:
+        _replace_system_departments(session.connection(), departments_by_id)
+
+
+def _migrate_backfill_system_departments(conn):
+    """마이그레이션 1: 기존 System.departments로 부서 인덱스 채우기"""
+    conn.execute(delete(SystemDepartment))
+    rows = conn.execute(
+        select(System.id, System.departments).where(System.is_deleted == False)
+    ).all()
+    _replace_system_departments(conn, {row.id: row.departments for row in rows})
+
+
+# ============== 대시보드 카운터 ==============
+
+# 값이 바뀌면 카운터에 영향을 주는 System 필드
+_DASHBOARD_FIELDS = ['status', 'progress', 'departments', 'created_at', 'is_deleted']
+
+
+def _dashboard_contribution(values):
+    """시스템 1건이 대시보드 카운터에 기여하는 {키: 값}"""
+    if not values or values.get('is_deleted'):
+        return {}
+
+    created_at = values.get('created_at') or datetime.now()
+    contribution = {
+        'total': 1,
+        f"status:{values.get('status')}": 1,
+        f"created:{created_at:%Y-%m}": 1
+    }
+    if values.get('progress') is not None:
+        contribution['progress_sum'] = values['progress']
+        contribution['progress_count'] = 1
+    for department in dict.fromkeys(values.get('departments') or []):
+        if department:
+            contribution[f"dept:{department}"] = 1
+    return contribution
+
+
+def _add_dashboard_delta(delta, old_values, new_values):
+    """old → new 변경에 따른 카운터 증감을 delta에 누적"""
+    for key, value in _dashboard_contribution(new_values).items():
+        delta[key] = delta.get(key, 0) + value
+    for key, value in _dashboard_contribution(old_values).items():
+        delta[key] = delta.get(key, 0) - value
+
+
+def _apply_dashboard_delta(connection, delta):
+    """누적된 증감을 dashboard_stats에 UPSERT로 반영"""
+    rows = [{'key': key, 'value': value} for key, value in delta.items() if value]
+    if not rows:
+        return
+    stmt = sqlite_insert(DashboardStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['key'],
+        set_={'value': DashboardStat.value + stmt.excluded.value}
+    )
+    connection.execute(stmt, rows)
+
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_dashboard_stats(session, flush_context):
+    """생성/수정/삭제된 System의 카운터 증감을 같은 트랜잭션에서 반영"""
+    delta = {}
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, System):
+            continue
+
+        new_values = {key: getattr(obj, key) for key in _DASHBOARD_FIELDS}
+        if obj in session.new:
+            _add_dashboard_delta(delta, None, new_values)
+            continue
+
+        state = inspect(obj)
+        old_values = dict(new_values)
+        for key in _DASHBOARD_FIELDS:
+            history = state.attrs[key].history
+            if history.has_changes():
+                old_values[key] = history.deleted[0] if history.deleted else None
+        if old_values != new_values:
+            _add_dashboard_delta(delta, old_values, new_values)
+
+    _apply_dashboard_delta(session.connection(), delta)
+
+
+def _compute_dashboard_counters(connection):
+    """전체 시스템을 다시 읽어 카운터 값을 계산"""
+    counters = {}
+    rows = connection.execution_options(yield_per=1000).execute(
+        select(*[System.__table__.c[key] for key in _DASHBOARD_FIELDS])
+        .where(System.is_deleted == False)
+    ).mappings()
+    for row in rows:
+        _add_dashboard_delta(counters, None, row)
+    return counters
+
+
+def rebuild_dashboard_stats():
+    """카운터를 전체 재계산 값으로 교체하고, 저장돼 있던 값과 다른 항목을 {키: (저장값, 재계산값)}로 반환"""
+    with session_scope() as session:
+        expected = _compute_dashboard_counters(session.connection())
+        stored = dict(session.execute(select(DashboardStat.key, DashboardStat.value)).all())
+
+        mismatches = {
+            key: (stored.get(key, 0), expected.get(key, 0))
+            for key in set(stored) | set(expected)
+            if abs(stored.get(key, 0) - expected.get(key, 0)) > 1e-6
+        }
+
+        session.execute(delete(DashboardStat))
+        rows = [{'key': key, 'value': value} for key, value in expected.items() if value]
+        if rows:
+            session.execute(insert(DashboardStat), rows)
+        return mismatches
+
+
+def _migrate_build_dashboard_stats(conn):
+    """마이그레이션 2: 대시보드 카운터 초기 적재"""
+    conn.execute(delete(DashboardStat))
+    _apply_dashboard_delta(conn, _compute_dashboard_counters(conn))
+
+
+# ============== 전문 검색 (FTS5) ==============
+
+# 검색 대상 컬럼 (systems_fts 컬럼 순서와 동일)
+SEARCH_COLUMNS = ['system_name', 'description', 'notes', 'api_info']
+
+# trigram 토크나이저는 3글자 단위로 색인하므로 더 짧은 검색어는 FTS로 찾을 수 없음
+FTS_MIN_TERM_LENGTH = 3
+
+
+def _migrate_create_system_search(conn):
+    """마이그레이션 3: systems_fts 전문 검색 테이블 및 동기화 트리거 생성
+
+    systems를 content 테이블로 쓰는 외부 콘텐츠 FTS5 테이블이라 텍스트를 중복 저장하지 않는다.
+    trigram 토크나이저는 띄어쓰기 없는 한글 합성어 안의 부분 문자열도 찾는다.
+    """
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_values = ', '.join(f"old.{c}" for c in SEARCH_COLUMNS)
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS systems_fts USING fts5("
+        f"{columns}, content='systems', content_rowid='id', tokenize='trigram')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS systems_fts_ai AFTER INSERT ON systems BEGIN "
+        f"INSERT INTO systems_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS systems_fts_ad AFTER DELETE ON systems BEGIN "
+        f"INSERT INTO systems_fts(systems_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS systems_fts_au AFTER UPDATE OF {columns} ON systems BEGIN "
+        f"INSERT INTO systems_fts(systems_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO systems_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    conn.execute(text("INSERT INTO systems_fts(systems_fts) VALUES ('rebuild')"))
+
+
+def _fts_match_expression(query):
+    """검색어를 FTS5 MATCH 식으로 변환 (FTS로 처리할 수 없으면 None)
+
+    공백으로 나눈 각 단어를 큰따옴표 문자열로 감싸 AND 결합한다.
+    trigram 색인은 부분 문자열 일치이므로 접두어 검색도 그대로 된다.
+    """
+    terms = query.split()
+    if not terms or any(len(term) < FTS_MIN_TERM_LENGTH for term in terms):
+        return None
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _system_search_condition(query):
+    """검색어 조건 (3글자 미만 단어가 있으면 LIKE 검색으로 대체)"""
+    expression = _fts_match_expression(query)
+    if expression is None:
+        condition = None
+        for term in query.split() or [query]:
+            term_condition = or_(*(
+                getattr(System, column).icontains(term, autoescape=True) for column in SEARCH_COLUMNS
+            ))
+            condition = term_condition if condition is None else condition & term_condition
+        return condition
+
+    return System.id.in_(
+        text("SELECT rowid FROM systems_fts WHERE systems_fts MATCH :fts_query")
+        .bindparams(fts_query=expression)
+        .columns(rowid=Integer)
+    )
+
+
+def search_systems(query, limit=20):
+    """관련도(bm25) 순 시스템 검색
+
+    반환: [{'id', 'system_name', 'status', 'progress', 'snippet'}]
+    snippet은 일치 부분을 **로 강조한 본문 일부 (LIKE 대체 검색일 때는 개요 앞부분).
+    """
+    expression = _fts_match_expression(query)
+
+    with session_scope() as session:
+        if expression is None:
+            rows = session.execute(
+                select(System.id, System.system_name, System.status, System.progress, System.description)
+                .where(System.is_deleted == False, _system_search_condition(query))
+                .order_by(System.updated_at.desc())
+                .limit(limit)
+            ).all()
+            return [
+                {'id': r.id, 'system_name': r.system_name, 'status': r.status,
+                 'progress': r.progress, 'snippet': (r.description or '')[:80]}
+                for r in rows
+            ]
+
+        rows = session.execute(text(
+            "SELECT s.id, s.system_name, s.status, s.progress, "
+            "snippet(systems_fts, -1, '**', '**', '…', 12) AS snippet "
+            "FROM systems_fts JOIN systems s ON s.id = systems_fts.rowid "
+            "WHERE systems_fts MATCH :fts_query AND s.is_deleted = 0 "
+            "ORDER BY systems_fts.rank LIMIT :limit"
+        ), {'fts_query': expression, 'limit': limit}).all()
+        return [dict(r._mapping) for r in rows]
+
+
+def _migrate_index_facet_columns(conn):
+    """마이그레이션 4: 목록 패싯 컬럼 인덱스 (기존 DB용, 신규 DB는 create_all에서 생성)"""
+    for column in ('frontend_platform', 'backend_platform', 'owner'):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_systems_{column} ON systems ({column})"))
+
+
+def _migrate_index_keyset_sort(conn):
+    """마이그레이션 5: keyset 페이지용 (정렬 컬럼, id) 인덱스 (기존 DB용)"""
+    for column in ('updated_at', 'progress', 'created_at'):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_systems_{column}_id ON systems ({column}, id)"))
+
+
+def _migrate_index_history(conn):
+    """마이그레이션 6: 이력 keyset 페이지용 (system_id, changed_at DESC, id DESC) 인덱스 (기존 DB용)"""
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_system_history_system_id_changed_at "
+        "ON system_history (system_id, changed_at DESC, id DESC)"
+    ))
+
+
+def _migrate_backfill_system_snapshots(conn):
+    """마이그레이션 7: 이력 타입 값 컬럼 추가 및 과거 시점 스냅샷 채우기
+
+    현재 상태에서 이력을 최신순으로 되돌리며 SNAPSHOT_INTERVAL건마다 스냅샷을 남기므로
+    기존 이력 기간도 시점 복원이 스냅샷 기준으로 동작한다.
+    """
+    history_columns = {row[1] for row in conn.execute(text("PRAGMA table_info(system_history)"))}
+    for column in ('old_data', 'new_data'):
+        if column not in history_columns:
+            conn.execute(text(f"ALTER TABLE system_history ADD COLUMN {column} JSON"))
+
+    system_rows = conn.execute(select(System.__table__)).mappings().all()
+    for system_row in system_rows:
+        system_id = system_row['id']
+        history = [
+            dict(row) for row in conn.execute(
+                select(SystemHistory.__table__).where(SystemHistory.system_id == system_id)
+            ).mappings()
+        ]
+        history.extend(_iter_archived_history(conn, system_id))
+        history.sort(key=lambda h: h['id'], reverse=True)
+
+        state = {key: _to_json_value(value) for key, value in system_row.items()}
+        snapshots = []
+
+        def add_snapshot(position):
+            # position: 아직 되돌리지 않은 가장 최근 이력의 위치 (없으면 이력 이전 상태)
+            if position < len(history):
+                row = history[position]
+                taken_at, history_id = row['changed_at'] or system_row['created_at'], row['id']
+            else:
+                taken_at, history_id = system_row['created_at'] or datetime.min, 0
+            snapshot_state = dict(state, updated_at=_to_json_value(taken_at)) if position else dict(state)
+            snapshots.append({
+                'system_id': system_id,
+                'history_id': history_id,
+                'taken_at': taken_at,
+                'state': snapshot_state
+            })
+
+        add_snapshot(0)
+        last_position = 0
+        deletes_left = sum(1 for row in history if row['field_name'] == 'deleted')
+        for position, row in enumerate(history, start=1):
+            if row['field_name'] == 'deleted':
+                deletes_left -= 1
+            if not _undo_history_on_state(state, row, deleted_before=deletes_left > 0):
+                # 생성 이력 직후 상태 (이보다 앞 시점에는 시스템이 없음)
+                if last_position != position - 1:
+                    add_snapshot(position - 1)
+                break
+            if position % SNAPSHOT_INTERVAL == 0 or position == len(history):
+                add_snapshot(position)
+                last_position = position
+
+        conn.execute(insert(SystemSnapshot), snapshots)
+
+
+def _migrate_backfill_service_costs(conn):
+    """마이그레이션 8: 기존 서비스의 현재 비용을 생성 월 기준으로 비용 추이에 반영"""
+    services = conn.execute(select(Service.__table__)).mappings().all()
+    if not services:
+        return
+    conn.execute(insert(ServiceCostSnapshot), [
+        {
+            'service_id': service['id'],
+            'service_name': service['service_name'],
+            'event': 'created',
+            'monthly_cost': service['monthly_cost'] or 0.0,
+            'previous_cost': 0.0,
+            'currency': service['currency'],
+            'changed_at': service['created_at'] or datetime.now()
+        }
+        for service in services
+    ])
+    for service in services:
+        month = (service['created_at'] or datetime.now()).strftime('%Y-%m')
+        _apply_cost_rollup(conn, month, service['monthly_cost'] or 0.0)
+
+
+# 순서대로 한 번씩 적용되는 스키마/데이터 마이그레이션
+MIGRATIONS = [
+    _migrate_backfill_system_departments,
+    _migrate_build_dashboard_stats,
+    _migrate_create_system_search,
+    _migrate_index_facet_columns,
+    _migrate_index_keyset_sort,
+    _migrate_index_history,
+    _migrate_backfill_system_snapshots,
+    _migrate_backfill_service_costs,
+]
 
 
 # ============== 대시보드 통계 ==============
 
+STATUS_OPTIONS = ['초기 개발', '개발 중', '테스트 필요', '운영 가능']
+
+
 def get_dashboard_stats():
-    """대시보드용 통계 데이터"""
-    session = get_session()
-    try:
-        # 전체 시스템 수
-        total = session.query(func.count(System.id))\
-            .filter(System.is_deleted == False).scalar()
-
-        # 상태별 시스템 수
-        status_counts = {}
-        for status in ['초기 개발', '개발 중', '테스트 필요', '운영 가능']:
-            count = session.query(func.count(System.id))\
-                .filter(System.is_deleted == False, System.status == status).scalar()
-            status_counts[status] = count
-
-        # 이번 달 신규 등록
-        first_day = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        new_this_month = session.query(func.count(System.id))\
-            .filter(System.is_deleted == False, System.created_at >= first_day).scalar()
-
-        # 평균 진행률
-        avg_progress = session.query(func.avg(System.progress))\
-            .filter(System.is_deleted == False).scalar() or 0
-
-        # 부서별 시스템 분포
-        systems = session.query(System).filter(System.is_deleted == False).all()
-        dept_distribution = {}
-        for system in systems:
-            if system.departments:
-                for dept in system.departments:
-                    dept_distribution[dept] = dept_distribution.get(dept, 0) + 1
+    """대시보드용 통계 데이터 (집계 값은 dashboard_stats 카운터에서 조회)"""
+    ensure_daily_snapshot()
+    with session_scope() as session:
+        active = System.is_deleted == False
+
+        counters = dict(session.execute(select(DashboardStat.key, DashboardStat.value)).all())
+
+        # 지난달 마지막 일일 스냅샷의 평균 진행률 (전월 대비 변화량 기준)
+        previous_day = (
+            select(func.max(DailySystemSnapshot.day))
+            .where(DailySystemSnapshot.day < date.today().replace(day=1))
+            .scalar_subquery()
+        )
+        previous_avg = session.execute(
+            select(func.avg(DailySystemSnapshot.progress)).where(DailySystemSnapshot.day == previous_day)
+        ).scalar()
+        total = int(counters.get('total', 0))
+        status_counts = {status: int(counters.get(f"status:{status}", 0)) for status in STATUS_OPTIONS}
+        new_this_month = int(counters.get(f"created:{datetime.now():%Y-%m}", 0))
+        progress_count = counters.get('progress_count', 0)
+        avg_progress = counters.get('progress_sum', 0) / progress_count if progress_count else 0
+        dept_distribution = {
+            key[len('dept:'):]: int(value)
+            for key, value in counters.items()
+            if key.startswith('dept:') and value > 0
+        }
+        total_cost = session.execute(
+            select(func.coalesce(func.sum(Service.monthly_cost), 0))
+        ).scalar()
 
         # 최근 수정된 시스템 (최근 5개)
-        recent_systems = session.query(System)\
-            .filter(System.is_deleted == False)\
-            .order_by(System.updated_at.desc())\
-            .limit(5)\
-            .all()
+        recent_systems = session.execute(
+            select(System.system_name, System.status, System.progress, System.updated_at)
+            .where(active)
+            .order_by(System.updated_at.desc())
+            .limit(5)
+        ).all()
 
         recent_updates = [{
             'system_name': s.system_name,
@@ -303,12 +1890,10 @@ def get_dashboard_stats():
 
         # 주의 필요 시스템 (진행률 30% 미만 또는 30일 이상 미업데이트)
         thirty_days_ago = datetime.now() - timedelta(days=30)
-        alert_systems = session.query(System)\
-            .filter(
-                System.is_deleted == False,
-                ((System.progress < 0.3) | (System.updated_at < thirty_days_ago))
-            )\
-            .all()
+        alert_systems = session.execute(
+            select(System.system_name, System.status, System.progress, System.updated_at)
+            .where(active, (System.progress < 0.3) | (System.updated_at < thirty_days_ago))
+        ).all()
 
         alerts = [{
             'system_name': s.system_name,
@@ -319,9 +1904,10 @@ def get_dashboard_stats():
         } for s in alert_systems]
 
         # 완료 임박 시스템 (진행률 90% 이상)
-        upcoming = session.query(System)\
-            .filter(System.is_deleted == False, System.progress >= 0.9, System.status != '운영 가능')\
-            .all()
+        upcoming = session.execute(
+            select(System.system_name, System.status, System.progress, System.target_date)
+            .where(active, System.progress >= 0.9, System.status != '운영 가능')
+        ).all()
 
         upcoming_systems = [{
             'system_name': s.system_name,
@@ -330,10 +1916,6 @@ def get_dashboard_stats():
             'target_date': s.target_date.strftime('%Y-%m-%d') if s.target_date else ''
         } for s in upcoming]
 
-        # 서비스 총 비용
-        services = session.query(Service).all()
-        total_cost = sum(s.monthly_cost for s in services)
-
         return {
             'total': total,
             'status_counts': status_counts,
@@ -342,46 +1924,33 @@ def get_dashboard_stats():
             'production_rate': status_counts.get('운영 가능', 0) / total if total > 0 else 0,
             'new_this_month': new_this_month,
             'avg_progress': avg_progress,
-            'progress_change': 0,  # 이전 달 대비 변화량 (추후 구현)
+            'progress_change': avg_progress - previous_avg if previous_avg is not None else 0,
             'dept_distribution': dept_distribution,
             'recent_updates': recent_updates,
             'alert_systems': alerts,
             'upcoming_systems': upcoming_systems,
             'total_cost': total_cost,
-            'monthly_costs': []  # 월별 비용 추이 (추후 구현)
+            'monthly_costs': get_monthly_costs()
         }
-    finally:
-        session.close()
 
 
 def get_all_departments():
     """모든 부서 목록 반환"""
-    session = get_session()
-    try:
-        systems = session.query(System).filter(System.is_deleted == False).all()
-        departments = set()
-        for system in systems:
-            if system.departments:
-                departments.update(system.departments)
-        return sorted(list(departments))
-    finally:
-        session.close()
+    with session_scope() as session:
+        return list(session.execute(
+            select(SystemDepartment.department.distinct()).order_by(SystemDepartment.department)
+        ).scalars())
 
 
 def get_all_platforms(platform_type='frontend'):
     """모든 플랫폼 목록 반환"""
-    session = get_session()
-    try:
-        systems = session.query(System).filter(System.is_deleted == False).all()
-        platforms = set()
-        for system in systems:
-            if platform_type == 'frontend' and system.frontend_platform:
-                platforms.add(system.frontend_platform)
-            elif platform_type == 'backend' and system.backend_platform:
-                platforms.add(system.backend_platform)
-        return sorted(list(platforms))
-    finally:
-        session.close()
+    column = System.frontend_platform if platform_type == 'frontend' else System.backend_platform
+    with session_scope() as session:
+        return list(session.execute(
+            select(column.distinct())
+            .where(System.is_deleted == False, column.isnot(None), column != '')
+            .order_by(column)
+        ).scalars())
 
 
 # 앱 시작 시 DB 초기화
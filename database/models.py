@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, Boolean, JSON, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -17,13 +17,13 @@ class System(Base):
     progress = Column(Float, default=0.0)
     status = Column(String(50), nullable=False, index=True)
 
-    frontend_platform = Column(String(100))
+    frontend_platform = Column(String(100), index=True)
     frontend_plan = Column(String(100))
-    backend_platform = Column(String(100))
+    backend_platform = Column(String(100), index=True)
     backend_plan = Column(String(100))
     api_info = Column(String(200))
 
-    owner = Column(String(100))
+    owner = Column(String(100), index=True)
     start_date = Column(Date)
     target_date = Column(Date)
     notes = Column(Text)
@@ -33,6 +33,13 @@ class System(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     created_by = Column(String(100))
 
+    __table_args__ = (
+        # 카드/칸반 keyset 페이지 (정렬 컬럼, id) 순회용 (system_name은 unique 인덱스 사용)
+        Index('ix_systems_updated_at_id', 'updated_at', 'id'),
+        Index('ix_systems_progress_id', 'progress', 'id'),
+        Index('ix_systems_created_at_id', 'created_at', 'id'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -67,6 +74,8 @@ class SystemHistory(Base):
     field_name = Column(String(100))
     old_value = Column(Text)
     new_value = Column(Text)
+    old_data = Column(JSON)  # 타입을 보존한 값 (날짜는 ISO 문자열), 이전 버전 이력은 NULL
+    new_data = Column(JSON)
     changed_by = Column(String(100))
     changed_at = Column(DateTime, default=datetime.now, index=True)
     comment = Column(Text)
@@ -78,12 +87,137 @@ class SystemHistory(Base):
             'field_name': self.field_name,
             'old_value': self.old_value,
             'new_value': self.new_value,
+            'old_data': self.old_data,
+            'new_data': self.new_data,
             'changed_by': self.changed_by,
             'changed_at': self.changed_at,
             'comment': self.comment
         }
 
 
+# 시스템별 최신순 이력 페이지 조회용 (system_id, changed_at DESC, id DESC)
+Index(
+    'ix_system_history_system_id_changed_at',
+    SystemHistory.system_id, SystemHistory.changed_at.desc(), SystemHistory.id.desc()
+)
+
+
+class SystemHistoryArchive(Base):
+    """보관된 변경 이력 (시스템별 이력 행 묶음을 zlib 압축 JSON으로 저장)"""
+    __tablename__ = 'system_history_archive'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    system_id = Column(Integer, nullable=False)
+    first_changed_at = Column(DateTime, nullable=False)
+    last_changed_at = Column(DateTime, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    field_names = Column(JSON)  # 묶음에 포함된 필드명 (필터 선택지용)
+    changed_by = Column(JSON)  # 묶음에 포함된 변경자
+    payload = Column(LargeBinary, nullable=False)
+    archived_at = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        Index('ix_system_history_archive_system_id_last', 'system_id', 'last_changed_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'system_id': self.system_id,
+            'first_changed_at': self.first_changed_at,
+            'last_changed_at': self.last_changed_at,
+            'row_count': self.row_count,
+            'field_names': self.field_names or [],
+            'changed_by': self.changed_by or [],
+            'archived_at': self.archived_at
+        }
+
+
+class SystemSnapshot(Base):
+    """시스템 전체 상태 스냅샷 (특정 시점 상태 복원의 기준점)"""
+    __tablename__ = 'system_snapshots'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    system_id = Column(Integer, nullable=False)
+    history_id = Column(Integer, nullable=False, default=0)  # 스냅샷에 반영된 마지막 이력 id
+    taken_at = Column(DateTime, nullable=False)  # 이 상태가 유효해진 시각
+    state = Column(JSON, nullable=False)  # System.to_dict() 형태 (날짜는 ISO 문자열)
+
+    __table_args__ = (
+        Index('ix_system_snapshots_system_id_taken_at', 'system_id', 'taken_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'system_id': self.system_id,
+            'history_id': self.history_id,
+            'taken_at': self.taken_at,
+            'state': self.state
+        }
+
+
+class DailySystemSnapshot(Base):
+    """시스템별 일일 진행률/상태 (그날 첫 조회 또는 첫 변경 직전 상태)"""
+    __tablename__ = 'system_daily_snapshots'
+
+    day = Column(Date, primary_key=True)
+    system_id = Column(Integer, primary_key=True)
+    progress = Column(Float)
+    status = Column(String(50))
+
+    def to_dict(self):
+        return {
+            'day': self.day,
+            'system_id': self.system_id,
+            'progress': self.progress,
+            'status': self.status
+        }
+
+
+class SystemDepartment(Base):
+    """시스템-부서 인덱스 모델 (삭제되지 않은 System.departments를 정규화)"""
+    __tablename__ = 'system_departments'
+
+    system_id = Column(Integer, primary_key=True)
+    department = Column(String(100), primary_key=True, index=True)
+
+    def to_dict(self):
+        return {
+            'system_id': self.system_id,
+            'department': self.department
+        }
+
+
+class DashboardStat(Base):
+    """대시보드 집계 카운터 모델 (시스템 생성/수정/삭제 시 증분 갱신)"""
+    __tablename__ = 'dashboard_stats'
+
+    # 'total', 'progress_sum', 'progress_count', 'status:개발 중', 'dept:개발팀', 'created:2024-05'
+    key = Column(String(200), primary_key=True)
+    value = Column(Float, default=0.0)
+
+    def to_dict(self):
+        return {
+            'key': self.key,
+            'value': self.value
+        }
+
+
+class DataVersion(Base):
+    """테이블별 데이터 버전 모델 (쓰기마다 증가, 캐시 키로 사용)"""
+    __tablename__ = 'data_versions'
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+    def to_dict(self):
+        return {
+            'table_name': self.table_name,
+            'version': self.version
+        }
+
+
 class Service(Base):
     """서비스 비용 모델"""
     __tablename__ = 'services'
@@ -114,6 +248,46 @@ class Service(Base):
         }
 
 
+class ServiceCostSnapshot(Base):
+    """서비스 비용 변경 기록 (생성/비용 수정/삭제 시점의 월 비용)"""
+    __tablename__ = 'service_cost_snapshots'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    service_id = Column(Integer, nullable=False, index=True)
+    service_name = Column(String(100))
+    event = Column(String(20), nullable=False)  # created / updated / deleted
+    monthly_cost = Column(Float, default=0.0)  # 변경 후 월 비용 (삭제 시 0)
+    previous_cost = Column(Float, default=0.0)
+    currency = Column(String(10))
+    changed_at = Column(DateTime, default=datetime.now, index=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'service_id': self.service_id,
+            'service_name': self.service_name,
+            'event': self.event,
+            'monthly_cost': self.monthly_cost,
+            'previous_cost': self.previous_cost,
+            'currency': self.currency,
+            'changed_at': self.changed_at
+        }
+
+
+class ServiceCostMonthly(Base):
+    """월별 비용 롤업 (그 달 안에서 생긴 월 비용 합계의 순변화량)"""
+    __tablename__ = 'service_cost_monthly'
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    cost_change = Column(Float, nullable=False, default=0.0)
+
+    def to_dict(self):
+        return {
+            'month': self.month,
+            'cost_change': self.cost_change
+        }
+
+
 class Attachment(Base):
     """첨부 파일 모델"""
     __tablename__ = 'attachments'
@@ -158,3 +332,25 @@ class Comment(Base):
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
+
+
+class ImportCheckpoint(Base):
+    """Excel 가져오기 재개 지점 모델"""
+    __tablename__ = 'import_checkpoints'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    import_key = Column(String(64), unique=True, nullable=False, index=True)
+    file_name = Column(String(500))
+    rows_done = Column(Integer, default=0)
+    result = Column(JSON)  # 누적 success/failed/skipped/errors
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'import_key': self.import_key,
+            'file_name': self.file_name,
+            'rows_done': self.rows_done,
+            'result': self.result,
+            'updated_at': self.updated_at
+        }
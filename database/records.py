@@ -0,0 +1,202 @@
+"""읽기 전용 시스템 레코드 컬렉션
+
+시스템 목록을 행별 dict 대신 컬럼 배열로 보관한다.
+- 수치/불리언/날짜 컬럼: numpy 배열 (쓰기 불가)
+- 상태/플랫폼/담당자 등 반복 문자열: 정수 코드 + intern된 문자열 목록
+- 부서: 전체 부서 코드 배열 + 시스템별 오프셋 (CSR)
+
+프로세스 공용 인스턴스(get_shared_system_records)는 systems 데이터 버전이 바뀔 때만 다시 읽으며,
+모든 세션이 같은 객체를 읽기 전용으로 공유한다.
+"""
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, JSON
+
+from .db import SYSTEM_CATEGORY_COLUMNS, _systems_select, get_data_versions, get_engine
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+def _encode_categories(values):
+    """문자열 값을 (코드 배열, intern된 범주 튜플)로 변환 (None은 -1)"""
+    lookup = {}
+    codes = np.fromiter(
+        (-1 if value is None else lookup.setdefault(value, len(lookup)) for value in values),
+        dtype=np.int32, count=len(values)
+    )
+    return _readonly(codes), tuple(sys.intern(value) for value in lookup)
+
+
+def _encode_departments(values):
+    """부서 목록 컬럼을 (부서 코드 배열, 오프셋 배열, 부서명 튜플)로 변환"""
+    lookup = {}
+    codes = []
+    offsets = [0]
+    for departments in values:
+        codes.extend(lookup.setdefault(name, len(lookup)) for name in departments or ())
+        offsets.append(len(codes))
+    return (
+        _readonly(np.array(codes, dtype=np.int32)),
+        _readonly(np.array(offsets, dtype=np.int64)),
+        tuple(sys.intern(name) for name in lookup)
+    )
+
+
+class SystemRecord:
+    """SystemRecords의 한 행 (dict처럼 읽는 가벼운 뷰)"""
+
+    __slots__ = ('_records', '_index')
+
+    def __init__(self, records, index):
+        self._records = records
+        self._index = index
+
+    def __getitem__(self, key):
+        if key not in self._records.columns:
+            raise KeyError(key)
+        return self._records.value(key, self._index)
+
+    def get(self, key, default=None):
+        return self._records.value(key, self._index) if key in self._records.columns else default
+
+    def keys(self):
+        return self._records.columns
+
+    def to_dict(self):
+        return {key: self._records.value(key, self._index) for key in self._records.columns}
+
+    def __repr__(self):
+        return f"SystemRecord({self.to_dict()!r})"
+
+
+class SystemRecords:
+    """컬럼 배열 기반 읽기 전용 시스템 컬렉션 (get_all_systems()와 같은 순서/값)"""
+
+    __slots__ = ('columns', '_kinds', '_data', '_length')
+
+    def __init__(self, columns, kinds, data, length):
+        self.columns = columns
+        self._kinds = kinds
+        self._data = data
+        self._length = length
+
+    @classmethod
+    def load(cls, include_deleted=False, columns=None):
+        """DB에서 Core select로 읽어 컬렉션 생성"""
+        stmt = _systems_select(include_deleted, columns)
+        with get_engine().connect() as conn:
+            rows = conn.execute(stmt).all()
+
+        selected = list(stmt.selected_columns)
+        values_by_column = list(zip(*rows)) if rows else [()] * len(selected)
+        kinds = {}
+        data = {}
+        for column, values in zip(selected, values_by_column):
+            name = column.name
+            if isinstance(column.type, JSON):
+                kinds[name], data[name] = 'list', _encode_departments(values)
+            elif isinstance(column.type, (Date, DateTime)):
+                unit = 'us' if isinstance(column.type, DateTime) else 'D'
+                kinds[name], data[name] = 'datetime', _readonly(np.array(values, dtype=f'datetime64[{unit}]'))
+            elif isinstance(column.type, Boolean):
+                kinds[name], data[name] = 'bool', _readonly(np.array([bool(v) for v in values], dtype=bool))
+            elif isinstance(column.type, Integer):
+                kinds[name], data[name] = 'int', _readonly(np.array(values, dtype=np.int64))
+            elif isinstance(column.type, Float):
+                kinds[name], data[name] = 'float', _readonly(np.array(values, dtype=np.float64))
+            elif name in SYSTEM_CATEGORY_COLUMNS:
+                kinds[name], data[name] = 'category', _encode_categories(values)
+            else:
+                array = np.empty(len(values), dtype=object)
+                array[:] = values
+                kinds[name], data[name] = 'text', _readonly(array)
+        return cls(tuple(kinds), kinds, data, len(rows))
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if not -self._length <= index < self._length:
+            raise IndexError(index)
+        return SystemRecord(self, index % self._length)
+
+    def __iter__(self):
+        return (SystemRecord(self, index) for index in range(self._length))
+
+    def value(self, column, index):
+        """index 행의 column 값 (get_all_systems()의 dict 값과 같은 타입)"""
+        kind = self._kinds[column]
+        data = self._data[column]
+        if kind == 'category':
+            codes, categories = data
+            code = codes[index]
+            return categories[code] if code >= 0 else None
+        if kind == 'list':
+            codes, offsets, names = data
+            return [names[code] for code in codes[offsets[index]:offsets[index + 1]]]
+        if kind == 'float':
+            value = data[index]
+            return None if np.isnan(value) else float(value)
+        if kind in ('int', 'bool', 'datetime'):
+            return data[index].item()
+        return data[index]
+
+    def column(self, column):
+        """컬럼 전체를 Series로 반환 (category 컬럼은 Categorical, 배열은 복사하지 않음)"""
+        kind = self._kinds[column]
+        data = self._data[column]
+        if kind == 'category':
+            codes, categories = data
+            values = pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+        elif kind == 'list':
+            values = [self.value(column, index) for index in range(self._length)]
+        elif kind == 'datetime':
+            values = data.astype('datetime64[ns]')
+        else:
+            values = data
+        return pd.Series(values, name=column, dtype=object if kind == 'list' else None, copy=False)
+
+    def department_pairs(self):
+        """(행 번호 배열, 부서명 Categorical) — 부서별 집계를 행 반복 없이 하기 위한 펼친 형태"""
+        codes, offsets, names = self._data['departments']
+        rows = np.repeat(np.arange(self._length), np.diff(offsets))
+        return rows, pd.Categorical.from_codes(codes, categories=pd.Index(names, dtype=object))
+
+    def to_frame(self, columns=None):
+        """DataFrame으로 변환 (날짜는 datetime64, 상태/플랫폼/담당자는 category, 부서는 list 컬럼)"""
+        columns = [c for c in columns if c in self._kinds] if columns else self.columns
+        return pd.DataFrame({column: self.column(column) for column in columns})
+
+    def to_dicts(self, columns=None, limit=None):
+        """get_all_systems() 형식의 dict 목록 (limit를 주면 앞에서부터 limit건)"""
+        columns = [c for c in columns if c in self._kinds] if columns else self.columns
+        length = self._length if limit is None else min(limit, self._length)
+        return [{column: self.value(column, index) for column in columns} for index in range(length)]
+
+
+_shared_records = {}
+_shared_records_lock = threading.Lock()
+
+
+def get_shared_system_records(include_deleted=False):
+    """프로세스 공용 SystemRecords (systems 데이터 버전이 바뀌면 다시 로드)
+
+    반환된 객체는 모든 세션이 공유하므로 수정하지 않는다 (배열은 쓰기 불가로 설정됨).
+    """
+    version = get_data_versions('systems')
+    cached = _shared_records.get(include_deleted)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _shared_records_lock:
+        cached = _shared_records.get(include_deleted)
+        if cached is None or cached[0] != version:
+            cached = (version, SystemRecords.load(include_deleted=include_deleted))
+            _shared_records[include_deleted] = cached
+    return cached[1]
@@ -5,7 +5,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db import get_all_systems, delete_system, get_all_departments, get_all_platforms
+from database.db import count_systems, count_systems_by_status, query_systems, query_systems_after, search_systems, delete_system, get_filter_facets, get_data_versions
 
 st.set_page_config(page_title="시스템 목록", layout="wide")
 
@@ -56,32 +56,108 @@ if 'confirm_delete' in st.session_state and st.session_state['confirm_delete']:
 
 st.markdown("<p class='page-title'>시스템 목록</p>", unsafe_allow_html=True)
 
-# 시스템 데이터 로드 (캐시 없이 항상 최신 데이터)
-systems = get_all_systems()
+status_options = ["초기 개발", "개발 중", "테스트 필요", "운영 가능"]
 
-# 필터 사이드바
-with st.sidebar:
-    st.markdown("### 필터")
 
-    status_options = ["초기 개발", "개발 중", "테스트 필요", "운영 가능"]
-    status_filter = st.multiselect("상태", options=status_options, default=status_options)
+def build_filters(statuses, departments, owners, progress_range, frontend, backend, search):
+    """위젯 값을 query_systems/get_filter_facets 필터 dict로 변환"""
+    return {
+        'statuses': statuses,
+        'departments': departments,
+        'owners': owners,
+        'progress_range': progress_range,
+        'frontend_platform': frontend if frontend != "전체" else None,
+        'backend_platform': backend if backend != "전체" else None,
+        'search': search
+    }
+
+
+# 필터 선택지별 건수 (데이터 버전이 바뀌거나 필터가 바뀔 때만 다시 조회)
+@st.cache_data(max_entries=32)
+def load_filter_facets(filters, versions):
+    return get_filter_facets(filters)
+
 
-    all_departments = get_all_departments()
-    dept_filter = st.multiselect("사용 부서", options=all_departments) if all_departments else []
+# 카드/칸반 뷰에서 한 번에 더 불러오는 개수
+CARD_PAGE_SIZE = 30
+KANBAN_PAGE_SIZE = 10
 
-    progress_range = st.slider("진행률", 0, 100, (0, 100), 5, format="%d%%")
 
-    frontend_platforms = ["전체"] + get_all_platforms("frontend")
-    frontend_filter = st.selectbox("Front-end", options=frontend_platforms)
+def load_keyset_pages(filters, sort, pages, page_size):
+    """keyset 페이지를 pages개까지 이어서 조회 (반환: 시스템 목록, 더 있는지 여부)"""
+    systems, cursor = [], None
+    for _ in range(pages):
+        page = query_systems_after(filters, after=cursor, limit=page_size, sort=sort)
+        systems.extend(page['systems'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    return systems, cursor is not None
+
+
+def facet_options(counts, selected):
+    """패싯 값 목록 (현재 선택값이 결과에서 빠져도 선택지에 유지)"""
+    return sorted((set(counts) | set(selected)) - {"전체"})
+
+
+# 위젯 생성 전에 세션 상태의 현재 필터로 건수를 계산
+facets = load_filter_facets(
+    build_filters(
+        st.session_state.get('list_status', status_options),
+        st.session_state.get('list_departments', []),
+        st.session_state.get('list_owners', []),
+        st.session_state.get('list_progress', (0, 100)),
+        st.session_state.get('list_frontend', "전체"),
+        st.session_state.get('list_backend', "전체"),
+        st.session_state.get('list_search', "")
+    ),
+    get_data_versions('systems')
+)
+
+# 필터 사이드바
+with st.sidebar:
+    st.markdown("### 필터")
 
-    backend_platforms = ["전체"] + get_all_platforms("backend")
-    backend_filter = st.selectbox("Back-end", options=backend_platforms)
+    status_filter = st.multiselect(
+        "상태", options=status_options, default=status_options, key='list_status',
+        format_func=lambda v: f"{v} ({facets['statuses'].get(v, 0)})"
+    )
+
+    dept_options = facet_options(facets['departments'], st.session_state.get('list_departments', []))
+    dept_filter = st.multiselect(
+        "사용 부서", options=dept_options, key='list_departments',
+        format_func=lambda v: f"{v} ({facets['departments'].get(v, 0)})"
+    ) if dept_options else []
+
+    owner_options = facet_options(facets['owners'], st.session_state.get('list_owners', []))
+    owner_filter = st.multiselect(
+        "담당자", options=owner_options, key='list_owners',
+        format_func=lambda v: f"{v} ({facets['owners'].get(v, 0)})"
+    ) if owner_options else []
+
+    progress_range = st.slider("진행률", 0, 100, (0, 100), 5, format="%d%%", key='list_progress')
+
+    frontend_platforms = ["전체"] + facet_options(
+        facets['frontend_platforms'], [st.session_state.get('list_frontend', "전체")]
+    )
+    frontend_filter = st.selectbox(
+        "Front-end", options=frontend_platforms, key='list_frontend',
+        format_func=lambda v: v if v == "전체" else f"{v} ({facets['frontend_platforms'].get(v, 0)})"
+    )
+
+    backend_platforms = ["전체"] + facet_options(
+        facets['backend_platforms'], [st.session_state.get('list_backend', "전체")]
+    )
+    backend_filter = st.selectbox(
+        "Back-end", options=backend_platforms, key='list_backend',
+        format_func=lambda v: v if v == "전체" else f"{v} ({facets['backend_platforms'].get(v, 0)})"
+    )
 
     if st.button("필터 초기화", use_container_width=True):
         st.rerun()
 
 # 검색
-search_query = st.text_input("검색", placeholder="시스템명 또는 내용 검색...")
+search_query = st.text_input("검색", placeholder="시스템명, 개요, 비고, API 정보 검색...", key='list_search')
 
 # 뷰 모드 및 정렬
 col1, col2, col3 = st.columns([2, 2, 1])
@@ -95,43 +171,47 @@ with col2:
 with col3:
     sort_order = st.selectbox("순서", ["내림차순", "오름차순"])
 
-# 데이터 필터링
-if systems:
-    df = pd.DataFrame(systems)
-
-    if status_filter:
-        df = df[df['status'].isin(status_filter)]
-
-    if dept_filter:
-        def has_department(depts):
-            if not depts:
-                return False
-            return any(d in depts for d in dept_filter)
-        df = df[df['departments'].apply(has_department)]
-
-    df = df[(df['progress'] * 100 >= progress_range[0]) & (df['progress'] * 100 <= progress_range[1])]
-
-    if frontend_filter != "전체":
-        df = df[df['frontend_platform'] == frontend_filter]
+# 필터/정렬 조건 (조회는 DB에서 수행)
+filters = build_filters(status_filter, dept_filter, owner_filter, progress_range,
+                        frontend_filter, backend_filter, search_query)
+sort_map = {"최근 수정일": "updated_at", "시스템명": "system_name", "진행률": "progress", "생성일": "created_at"}
+sort = (sort_map[sort_by], 'asc' if sort_order == "오름차순" else 'desc')
 
-    if backend_filter != "전체":
-        df = df[df['backend_platform'] == backend_filter]
+# 조건이 바뀌면 카드/칸반의 "더 보기" 상태를 처음 페이지로 되돌림
+view_signature = repr((filters, sort))
+if st.session_state.get('list_view_signature') != view_signature:
+    st.session_state['list_view_signature'] = view_signature
+    st.session_state['card_pages'] = 1
+    st.session_state['kanban_pages'] = {}
 
-    if search_query:
-        q = search_query.lower()
-        df = df[
-            df['system_name'].str.lower().str.contains(q, na=False) |
-            df['description'].str.lower().str.contains(q, na=False)
-        ]
+if count_systems() > 0:
+    total = count_systems(filters)
 
-    sort_map = {"최근 수정일": "updated_at", "시스템명": "system_name", "진행률": "progress", "생성일": "created_at"}
-    df = df.sort_values(sort_map[sort_by], ascending=(sort_order == "오름차순"))
+    st.caption(f"총 {total}개 시스템")
 
-    st.caption(f"총 {len(df)}개 시스템")
+    if search_query and total > 0:
+        with st.expander("관련도 순 검색 결과", expanded=False):
+            for result in search_systems(search_query, limit=5):
+                st.markdown(f"**{result['system_name']}** · {result['status']}")
+                st.caption(result['snippet'])
 
-    if len(df) == 0:
+    if total == 0:
         st.info("조건에 맞는 시스템이 없습니다.")
     elif view_mode == "테이블":
+        page_col1, page_col2, page_col3 = st.columns([1, 1, 3])
+        with page_col1:
+            page_size = st.selectbox("페이지당 행 수", [20, 50, 100], index=1)
+        page_count = (total + page_size - 1) // page_size
+        # 필터 변경으로 페이지 수가 줄어든 경우 마지막 페이지로 보정
+        if st.session_state.get('list_page', 1) > page_count:
+            st.session_state['list_page'] = page_count
+        with page_col2:
+            page = st.number_input("페이지", min_value=1, max_value=page_count, key='list_page')
+        with page_col3:
+            st.caption(f"{page} / {page_count} 페이지")
+
+        df = pd.DataFrame(query_systems(filters, sort, limit=page_size, offset=(page - 1) * page_size)['systems'])
+
         display_df = df.copy()
         display_df['progress_pct'] = display_df['progress'] * 100
         display_df['departments_str'] = display_df['departments'].apply(lambda x: ', '.join(x) if x else '')
@@ -169,8 +249,10 @@ if systems:
                     st.rerun()
 
     elif view_mode == "카드":
+        systems, has_more = load_keyset_pages(filters, sort, st.session_state['card_pages'], CARD_PAGE_SIZE)
+
         cols = st.columns(3)
-        for idx, (_, row) in enumerate(df.iterrows()):
+        for idx, row in enumerate(systems):
             with cols[idx % 3]:
                 with st.container(border=True):
                     st.markdown(f"**{row['system_name']}**")
@@ -189,17 +271,29 @@ if systems:
                             st.session_state['confirm_delete'] = {'name': row['system_name'], 'id': row['id']}
                             st.rerun()
 
+        if has_more:
+            if st.button(f"더 보기 ({len(systems)}/{total})", use_container_width=True):
+                st.session_state['card_pages'] += 1
+                st.rerun()
+
     elif view_mode == "칸반":
         statuses = ["초기 개발", "개발 중", "테스트 필요", "운영 가능"]
+        status_totals = count_systems_by_status(filters)
         cols = st.columns(len(statuses))
 
         for idx, status in enumerate(statuses):
             with cols[idx]:
                 st.markdown(f"**{status}**")
-                status_df = df[df['status'] == status]
-                st.caption(f"{len(status_df)}개")
+                status_total = status_totals.get(status, 0)
+                st.caption(f"{status_total}개")
 
-                for _, row in status_df.iterrows():
+                if status_total == 0:
+                    continue
+
+                pages = st.session_state['kanban_pages'].get(status, 1)
+                systems, has_more = load_keyset_pages({**filters, 'statuses': [status]}, sort, pages, KANBAN_PAGE_SIZE)
+
+                for row in systems:
                     with st.container(border=True):
                         st.markdown(f"**{row['system_name']}**")
                         st.progress(row['progress'])
@@ -215,6 +309,11 @@ if systems:
                             if st.button("삭제", key=f"del_kb_{row['id']}", use_container_width=True):
                                 st.session_state['confirm_delete'] = {'name': row['system_name'], 'id': row['id']}
                                 st.rerun()
+
+                if has_more:
+                    if st.button(f"더 보기 ({len(systems)}/{status_total})", key=f"more_kb_{status}", use_container_width=True):
+                        st.session_state['kanban_pages'][status] = pages + 1
+                        st.rerun()
 else:
     st.info("등록된 시스템이 없습니다.")
     if st.button("시스템 등록하기"):
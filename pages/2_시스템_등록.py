@@ -5,7 +5,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db import get_all_systems, get_system_by_name, create_system, update_system
+from database.db import get_system_records, get_system_by_name, create_system, update_system
 from utils.validators import validate_system_data
 
 st.set_page_config(page_title="시스템 등록", layout="wide")
@@ -40,7 +40,7 @@ mode = st.radio(
 )
 
 if mode == "기존 시스템 수정":
-    systems = get_all_systems()
+    systems = get_system_records(columns=['system_name'])
     system_names = [s['system_name'] for s in systems]
 
     if system_names:
@@ -256,11 +256,9 @@ if submitted:
                 # 세션 초기화
                 if 'edit_system' in st.session_state:
                     del st.session_state['edit_system']
-                st.cache_data.clear()
         else:
             update_system(system_data['id'], data, changed_by=owner)
             st.success(f"'{system_name}' 시스템이 수정되었습니다!")
-            st.cache_data.clear()
 
 if cancelled:
     if 'edit_system' in st.session_state:
@@ -1,13 +1,12 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db import get_all_services, create_service, update_service, delete_service
-from utils.charts import create_cost_pie
+from database.db import get_all_services, create_service, update_service, delete_service, get_data_versions, get_monthly_costs
+from utils.charts import create_cost_pie, create_monthly_trend, create_horizontal_bar
 from utils.validators import validate_service_data
 
 st.set_page_config(page_title="비용 관리", layout="wide")
@@ -26,13 +25,18 @@ st.markdown("""
 st.markdown("<p class='page-title'>서비스 비용 관리</p>", unsafe_allow_html=True)
 
 
-# 데이터 로드
-@st.cache_data(ttl=30)
-def load_services():
+# 데이터 로드 (서비스 데이터 버전이 바뀔 때만 다시 조회)
+@st.cache_data(max_entries=4)
+def load_services(versions):
     return get_all_services()
 
 
-services = load_services()
+@st.cache_data(max_entries=4)
+def load_monthly_costs(versions):
+    return get_monthly_costs(months=24)
+
+
+services = load_services(get_data_versions('services'))
 
 # 서비스 추가
 with st.expander("새 서비스 추가", expanded=False):
@@ -69,7 +73,6 @@ with st.expander("새 서비스 추가", expanded=False):
             else:
                 create_service(data)
                 st.success(f"{service_name} 추가됨")
-                st.cache_data.clear()
                 st.rerun()
 
 st.divider()
@@ -185,7 +188,6 @@ if services:
                 else:
                     update_service(edit_data['id'], updated_data)
                     st.success(f"{edit_service_name} 수정됨")
-                    st.cache_data.clear()
                     st.rerun()
 
     # 서비스 삭제
@@ -207,7 +209,6 @@ if services:
                 service_data = services_df[services_df['service_name'] == service_to_delete].iloc[0]
                 delete_service(service_data['id'])
                 st.success(f"{service_to_delete} 삭제됨")
-                st.cache_data.clear()
                 st.rerun()
 
     st.divider()
@@ -217,29 +218,25 @@ if services:
 
     with col1:
         st.markdown("<p class='section-title'>서비스별 비용 비중</p>", unsafe_allow_html=True)
-        fig = create_cost_pie(services)
+        fig = create_cost_pie(dict(zip(services_df['service_name'], services_df['monthly_cost'])))
         st.plotly_chart(fig, use_container_width=True)
 
     with col2:
         st.markdown("<p class='section-title'>비용 순위</p>", unsafe_allow_html=True)
         sorted_df = services_df.sort_values('monthly_cost', ascending=True)
 
-        fig = px.bar(
-            sorted_df,
-            x='monthly_cost',
-            y='service_name',
-            orientation='h',
-            labels={'monthly_cost': '월 비용 (USD)', 'service_name': '서비스'},
-            color='monthly_cost',
-            color_continuous_scale='Blues'
-        )
-        fig.update_layout(
-            showlegend=False,
-            margin=dict(t=20, b=40, l=100, r=20),
-            height=350
+        fig = create_horizontal_bar(
+            dict(zip(sorted_df['service_name'], sorted_df['monthly_cost'])),
+            '월 비용 (USD)', '서비스', 'Blues'
         )
         st.plotly_chart(fig, use_container_width=True)
 
+    # 월별 비용 추이 (월별 롤업 기준)
+    monthly_costs = load_monthly_costs(get_data_versions('services'))
+    if len(monthly_costs) > 1:
+        st.markdown("<p class='section-title'>월별 비용 추이</p>", unsafe_allow_html=True)
+        st.plotly_chart(create_monthly_trend(monthly_costs), use_container_width=True)
+
 else:
     st.info("등록된 서비스가 없습니다. 새 서비스를 추가해주세요.")
 
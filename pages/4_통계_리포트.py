@@ -1,14 +1,18 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db import get_all_systems, get_dashboard_stats, get_all_services
+from database.db import get_dashboard_stats, get_all_services, get_data_versions
+from database.records import get_shared_system_records
+from utils.charts import (
+    create_status_pie, create_progress_histogram, create_horizontal_bar, create_vertical_bar,
+    create_cost_pie, create_monthly_trend, create_stacked_bar, create_burndown, progress_bins
+)
+from utils.analytics import load_daily_snapshots, compute_progress_trends, department_frame, department_summary
 
 st.set_page_config(page_title="통계 리포트", layout="wide")
 
@@ -26,22 +30,30 @@ st.markdown("""
 st.markdown("<p class='page-title'>통계 리포트</p>", unsafe_allow_html=True)
 
 
-# 데이터 로드
-@st.cache_data(ttl=60)
-def load_data():
-    systems = get_all_systems()
+# 데이터 로드 (데이터 버전이나 날짜가 바뀔 때만 다시 조회)
+# 미업데이트 알림, 이번 달 신규 등 오늘 기준 값과 일별 스냅샷 기록이 있어 날짜도 캐시 키에 포함
+@st.cache_data(max_entries=4)
+def load_data(versions, today):
     stats = get_dashboard_stats()
     services = get_all_services()
-    return systems, stats, services
+    return stats, services
+
+
+@st.cache_data(max_entries=4)
+def load_progress_trends(versions, today):
+    return compute_progress_trends(load_daily_snapshots())
 
 
-systems, stats, services = load_data()
+stats, services = load_data(get_data_versions('systems', 'services'), date.today())
 
-if not systems:
+# 시스템 목록은 세션마다 복사하지 않고 프로세스 공용 인스턴스를 읽음
+systems = get_shared_system_records()
+
+if len(systems) == 0:
     st.info("등록된 시스템이 없습니다. 시스템을 먼저 등록해주세요.")
     st.stop()
 
-df = pd.DataFrame(systems)
+df = systems.to_frame(['id', 'status', 'progress', 'frontend_platform', 'backend_platform', 'created_at'])
 
 # 리포트 기간 선택
 st.sidebar.markdown("### 리포트 설정")
@@ -60,11 +72,10 @@ if report_period != "전체":
         "최근 1년": 365
     }
     cutoff_date = datetime.now() - timedelta(days=period_days[report_period])
-    df['created_at'] = pd.to_datetime(df['created_at'])
     df = df[df['created_at'] >= cutoff_date]
 
 # 탭 구성
-tab1, tab2, tab3, tab4 = st.tabs(["개요", "상세 분석", "부서별", "비용 분석"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["개요", "상세 분석", "부서별", "비용 분석", "추이"])
 
 with tab1:
     st.markdown("<p class='section-title'>전체 현황 요약</p>", unsafe_allow_html=True)
@@ -91,45 +102,12 @@ with tab1:
 
     with col1:
         st.markdown("**상태별 시스템 수**")
-        status_counts = df['status'].value_counts().reset_index()
-        status_counts.columns = ['status', 'count']
-
-        color_map = {
-            '초기 개발': '#FF6B6B',
-            '개발 중': '#4ECDC4',
-            '테스트 필요': '#FFE66D',
-            '운영 가능': '#95E1D3'
-        }
-
-        fig = px.pie(
-            status_counts,
-            values='count',
-            names='status',
-            color='status',
-            color_discrete_map=color_map,
-            hole=0.4
-        )
-        fig.update_layout(margin=dict(t=20, b=20, l=20, r=20), height=350)
-        st.plotly_chart(fig, use_container_width=True)
+        status_counts = df['status'].value_counts()
+        st.plotly_chart(create_status_pie(status_counts.to_dict()), use_container_width=True)
 
     with col2:
         st.markdown("**진행률 분포**")
-        df['progress_pct'] = df['progress'] * 100
-
-        fig = px.histogram(
-            df,
-            x='progress_pct',
-            nbins=10,
-            color_discrete_sequence=['#0066CC']
-        )
-        fig.update_layout(
-            xaxis_title='진행률 (%)',
-            yaxis_title='시스템 수',
-            margin=dict(t=20, b=40, l=40, r=20),
-            height=350
-        )
-        fig.update_xaxes(range=[0, 100], dtick=10)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(create_progress_histogram(progress_bins(df['progress'])), use_container_width=True)
 
 with tab2:
     st.markdown("<p class='section-title'>상세 분석</p>", unsafe_allow_html=True)
@@ -139,46 +117,14 @@ with tab2:
 
     with col1:
         st.markdown("**Front-end 플랫폼 분포**")
-        frontend_counts = df['frontend_platform'].fillna('미지정').value_counts().reset_index()
-        frontend_counts.columns = ['platform', 'count']
-
-        fig = px.bar(
-            frontend_counts,
-            x='count',
-            y='platform',
-            orientation='h',
-            color='count',
-            color_continuous_scale='Blues'
-        )
-        fig.update_layout(
-            xaxis_title='시스템 수',
-            yaxis_title='플랫폼',
-            margin=dict(t=20, b=40, l=100, r=20),
-            height=300,
-            showlegend=False
-        )
+        frontend_counts = df['frontend_platform'].astype(object).fillna('미지정').value_counts()
+        fig = create_horizontal_bar(frontend_counts.to_dict(), '시스템 수', '플랫폼', 'Blues', height=300)
         st.plotly_chart(fig, use_container_width=True)
 
     with col2:
         st.markdown("**Back-end 플랫폼 분포**")
-        backend_counts = df['backend_platform'].fillna('미지정').value_counts().reset_index()
-        backend_counts.columns = ['platform', 'count']
-
-        fig = px.bar(
-            backend_counts,
-            x='count',
-            y='platform',
-            orientation='h',
-            color='count',
-            color_continuous_scale='Greens'
-        )
-        fig.update_layout(
-            xaxis_title='시스템 수',
-            yaxis_title='플랫폼',
-            margin=dict(t=20, b=40, l=100, r=20),
-            height=300,
-            showlegend=False
-        )
+        backend_counts = df['backend_platform'].astype(object).fillna('미지정').value_counts()
+        fig = create_horizontal_bar(backend_counts.to_dict(), '시스템 수', '플랫폼', 'Greens', height=300)
         st.plotly_chart(fig, use_container_width=True)
 
     st.divider()
@@ -186,97 +132,46 @@ with tab2:
     # 상태-진행률 매트릭스
     st.markdown("**상태별 평균 진행률**")
 
-    status_progress = df.groupby('status')['progress'].mean().reset_index()
-    status_progress['progress'] = status_progress['progress'] * 100
-    status_progress.columns = ['상태', '평균 진행률']
-
-    fig = px.bar(
-        status_progress,
-        x='상태',
-        y='평균 진행률',
-        color='평균 진행률',
-        color_continuous_scale='RdYlGn'
-    )
-    fig.update_layout(
-        yaxis_title='평균 진행률 (%)',
-        margin=dict(t=20, b=40, l=40, r=20),
-        height=350,
-        showlegend=False
-    )
+    status_progress = df.groupby('status', observed=True)['progress'].mean() * 100
+    fig = create_vertical_bar(status_progress.to_dict(), '상태', '평균 진행률 (%)')
     st.plotly_chart(fig, use_container_width=True)
 
 with tab3:
     st.markdown("<p class='section-title'>부서별 분석</p>", unsafe_allow_html=True)
 
-    # 부서 데이터 추출
-    dept_data = []
-    for _, row in df.iterrows():
-        if row['departments']:
-            for dept in row['departments']:
-                dept_data.append({
-                    'department': dept,
-                    'system_name': row['system_name'],
-                    'status': row['status'],
-                    'progress': row['progress']
-                })
-
-    if dept_data:
-        dept_df = pd.DataFrame(dept_data)
+    # 부서 데이터 (공용 레코드의 부서 코드를 펼친 뒤 기간 필터된 시스템으로 한정)
+    dept_df = department_frame(systems)
+    dept_df = dept_df[dept_df['id'].isin(df['id'])]
+
+    if not dept_df.empty:
+        dept_summary = department_summary(dept_df)
 
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("**부서별 시스템 수**")
-            dept_counts = dept_df.groupby('department').size().reset_index(name='count')
-            dept_counts = dept_counts.sort_values('count', ascending=True)
-
-            fig = px.bar(
-                dept_counts,
-                x='count',
-                y='department',
-                orientation='h',
-                color='count',
-                color_continuous_scale='Purples'
-            )
-            fig.update_layout(
-                xaxis_title='시스템 수',
-                yaxis_title='부서',
-                margin=dict(t=20, b=40, l=100, r=20),
-                height=350,
-                showlegend=False
-            )
+            dept_counts = dept_summary['count'].sort_values(ascending=True)
+            fig = create_horizontal_bar(dept_counts.to_dict(), '시스템 수', '부서', 'Purples')
             st.plotly_chart(fig, use_container_width=True)
 
         with col2:
             st.markdown("**부서별 평균 진행률**")
-            dept_progress = dept_df.groupby('department')['progress'].mean().reset_index()
-            dept_progress['progress'] = dept_progress['progress'] * 100
-            dept_progress = dept_progress.sort_values('progress', ascending=True)
-
-            fig = px.bar(
-                dept_progress,
-                x='progress',
-                y='department',
-                orientation='h',
-                color='progress',
-                color_continuous_scale='RdYlGn'
-            )
-            fig.update_layout(
-                xaxis_title='평균 진행률 (%)',
-                yaxis_title='부서',
-                margin=dict(t=20, b=40, l=100, r=20),
-                height=350,
-                showlegend=False
-            )
+            dept_progress = (dept_summary['avg_progress'] * 100).round(2).sort_values(ascending=True)
+            fig = create_horizontal_bar(dept_progress.to_dict(), '평균 진행률 (%)', '부서', 'RdYlGn')
             st.plotly_chart(fig, use_container_width=True)
 
+        st.markdown("**부서별 상태 구성**")
+        status_mix = dept_summary.drop(columns=['count', 'avg_progress']).stack()
+        rows = [(dept, status, int(count)) for (dept, status), count in status_mix.items() if count > 0]
+        st.plotly_chart(create_stacked_bar(rows, '부서', '시스템 수'), use_container_width=True)
+
         st.divider()
 
         # 부서별 상세 테이블
         st.markdown("**부서별 시스템 목록**")
-        selected_dept = st.selectbox("부서 선택", options=dept_df['department'].unique())
+        selected_dept = st.selectbox("부서 선택", options=dept_summary.index.tolist())
 
-        filtered = dept_df[dept_df['department'] == selected_dept]
+        filtered = dept_df[dept_df['department'] == selected_dept].sort_values('system_name')
         display = filtered[['system_name', 'status', 'progress']].copy()
         display['progress'] = display['progress'] * 100
         display.columns = ['시스템명', '상태', '진행률(%)']
@@ -308,36 +203,23 @@ with tab4:
 
         with col1:
             st.markdown("**서비스별 비용 비중**")
-            fig = px.pie(
-                services_df,
-                values='monthly_cost',
-                names='service_name',
-                hole=0.4
-            )
-            fig.update_layout(margin=dict(t=20, b=20, l=20, r=20), height=350)
+            fig = create_cost_pie(dict(zip(services_df['service_name'], services_df['monthly_cost'])))
             st.plotly_chart(fig, use_container_width=True)
 
         with col2:
             st.markdown("**비용 순위**")
             sorted_services = services_df.sort_values('monthly_cost', ascending=True)
-
-            fig = px.bar(
-                sorted_services,
-                x='monthly_cost',
-                y='service_name',
-                orientation='h',
-                color='monthly_cost',
-                color_continuous_scale='Reds'
-            )
-            fig.update_layout(
-                xaxis_title='월 비용 (USD)',
-                yaxis_title='서비스',
-                margin=dict(t=20, b=40, l=100, r=20),
-                height=350,
-                showlegend=False
+            fig = create_horizontal_bar(
+                dict(zip(sorted_services['service_name'], sorted_services['monthly_cost'])),
+                '월 비용 (USD)', '서비스', 'Reds'
             )
             st.plotly_chart(fig, use_container_width=True)
 
+        if len(stats['monthly_costs']) > 1:
+            st.divider()
+            st.markdown("**월별 비용 추이**")
+            st.plotly_chart(create_monthly_trend(stats['monthly_costs']), use_container_width=True)
+
         # 비용 테이블
         st.divider()
         st.markdown("**상세 비용 내역**")
@@ -349,6 +231,46 @@ with tab4:
     else:
         st.info("등록된 서비스가 없습니다.")
 
+with tab5:
+    st.markdown("<p class='section-title'>진행 추이</p>", unsafe_allow_html=True)
+
+    # 일별 스냅샷 기반 (변경 이력은 조회하지 않음)
+    trends = load_progress_trends(get_data_versions('systems', 'system_daily_snapshots'), date.today())
+    burndown = trends['burndown']
+
+    if len(burndown) > 1:
+        st.markdown("**번다운**")
+        fig = create_burndown(
+            burndown['day'].dt.strftime('%Y-%m-%d').tolist(),
+            burndown['remaining_systems'].tolist(),
+            burndown['remaining_work'].round(2).tolist()
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("**월별 평균 진행률 변화**")
+            monthly = trends['monthly_progress']
+            change = dict(zip(monthly['month'], (monthly['change'].fillna(0) * 100).round(2)))
+            fig = create_vertical_bar(change, '월', '전월 대비 (%p)')
+            st.plotly_chart(fig, use_container_width=True)
+
+        with col2:
+            st.markdown("**월별 상태 전환**")
+            transitions = trends['transitions']
+            if not transitions.empty:
+                rows = list(zip(
+                    transitions['month'],
+                    transitions['from_status'] + ' → ' + transitions['to_status'],
+                    transitions['count'].tolist()
+                ))
+                st.plotly_chart(create_stacked_bar(rows, '월', '전환 수'), use_container_width=True)
+            else:
+                st.info("상태 전환 기록이 없습니다.")
+    else:
+        st.info("추이를 표시하려면 이틀 이상의 일별 스냅샷이 필요합니다.")
+
 # 리포트 다운로드
 st.divider()
 st.markdown("<p class='section-title'>리포트 다운로드</p>", unsafe_allow_html=True)
@@ -357,8 +279,9 @@ col1, col2 = st.columns(2)
 
 with col1:
     if st.button("Excel 리포트 다운로드", use_container_width=True):
-        from utils.excel_handler import export_to_excel
-        excel_data = export_to_excel(systems)
+        from utils.excel_handler import export_systems_to_excel
+        with export_systems_to_excel() as spooled:
+            excel_data = spooled.read()
         st.download_button(
             label="다운로드",
             data=excel_data,
@@ -368,8 +291,8 @@ with col1:
 
 with col2:
     if st.button("CSV 다운로드", use_container_width=True):
-        from utils.excel_handler import export_to_csv
-        csv_data = export_to_csv(systems)
+        from utils.excel_handler import export_systems_to_csv
+        csv_data = b''.join(export_systems_to_csv())
         st.download_button(
             label="다운로드",
             data=csv_data,
@@ -5,7 +5,7 @@ from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db import get_all_systems, get_system_history
+from database.db import get_system_records, get_system_history_page, count_system_history, get_history_filter_options, checkpoint_db, DB_PATH
 
 st.set_page_config(page_title="설정", layout="wide")
 
@@ -68,7 +68,7 @@ with tab1:
 with tab2:
     st.markdown("<p class='section-title'>변경 이력 조회</p>", unsafe_allow_html=True)
 
-    systems = get_all_systems()
+    systems = get_system_records(columns=['id', 'system_name'])
 
     if systems:
         system_names = [s['system_name'] for s in systems]
@@ -77,10 +77,39 @@ with tab2:
         selected_data = next((s for s in systems if s['system_name'] == selected_system), None)
 
         if selected_data:
-            history = get_system_history(selected_data['id'])
+            options = get_history_filter_options(selected_data['id'])
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                field_filter = st.multiselect("필드", options=options['field_names'])
+            with col2:
+                user_filter = st.multiselect("변경자", options=options['changed_by'])
+            with col3:
+                date_range = st.date_input("변경일", value=(), format="YYYY-MM-DD")
+
+            history_filters = {
+                'field_names': field_filter,
+                'changed_by': user_filter,
+                'date_from': date_range[0] if len(date_range) > 0 else None,
+                'date_to': date_range[1] if len(date_range) > 1 else None
+            }
+
+            # 시스템/필터가 바뀌면 첫 페이지로 (history_cursors[i]는 i번째 페이지 시작 커서)
+            history_signature = repr((selected_data['id'], history_filters, items_per_page))
+            if st.session_state.get('history_signature') != history_signature:
+                st.session_state['history_signature'] = history_signature
+                st.session_state['history_cursors'] = [None]
+
+            cursors = st.session_state['history_cursors']
+            total = count_system_history(selected_data['id'], history_filters)
+            page = get_system_history_page(
+                selected_data['id'], history_filters, before=cursors[-1], limit=items_per_page
+            )
+            history = page['history']
 
             if history:
-                st.write(f"**총 {len(history)}건의 변경 이력**")
+                page_count = (total + items_per_page - 1) // items_per_page
+                st.write(f"**총 {total}건의 변경 이력** ({len(cursors)} / {page_count} 페이지)")
 
                 for h in history:
                     with st.expander(
@@ -97,6 +126,16 @@ with tab2:
 
                         if h['comment']:
                             st.write(f"**코멘트:** {h['comment']}")
+
+                col1, col2, col3 = st.columns([1, 1, 3])
+                with col1:
+                    if st.button("이전", disabled=len(cursors) == 1, use_container_width=True):
+                        cursors.pop()
+                        st.rerun()
+                with col2:
+                    if st.button("다음", disabled=page['next_cursor'] is None, use_container_width=True):
+                        cursors.append(page['next_cursor'])
+                        st.rerun()
             else:
                 st.info("변경 이력이 없습니다.")
     else:
@@ -108,7 +147,7 @@ with tab3:
     # 데이터베이스 정보
     st.markdown("**데이터베이스 정보**")
 
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'dev_systems.db')
+    db_path = DB_PATH
 
     col1, col2 = st.columns(2)
 
@@ -142,6 +181,8 @@ with tab3:
 
     if st.button("DB 백업 다운로드", use_container_width=False):
         if os.path.exists(db_path):
+            # WAL 파일에 남은 변경사항을 DB 파일에 반영한 뒤 읽기
+            checkpoint_db()
             with open(db_path, 'rb') as f:
                 db_data = f.read()
 
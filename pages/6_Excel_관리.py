@@ -1,13 +1,16 @@
 import streamlit as st
 import pandas as pd
+import hashlib
+import json
 from datetime import datetime
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db import get_all_systems
-from utils.excel_handler import import_from_excel, export_to_excel, export_to_csv, create_empty_template, get_db_columns, get_all_columns
+from database.db import get_import_checkpoint, clear_import_checkpoint
+from database.records import get_shared_system_records
+from utils.excel_handler import import_from_excel, import_excel_stream, get_excel_row_count, export_systems_to_excel, export_systems_to_csv, create_empty_template, get_db_columns, get_all_columns
 
 st.set_page_config(page_title="Excel 관리", layout="wide")
 
@@ -50,10 +53,16 @@ with tab1:
             # 헤더 행 선택
             header_row = st.number_input("헤더 행 (0부터 시작)", min_value=0, max_value=10, value=0)
 
-            # 데이터 로드
-            df = pd.read_excel(uploaded_file, sheet_name=selected_sheet, header=header_row)
+            # xlsx는 미리보기만 읽고 가져오기는 스트리밍으로 처리 (xls는 전체 로드)
+            streaming = uploaded_file.name.lower().endswith('.xlsx')
+            if streaming:
+                df = pd.read_excel(uploaded_file, sheet_name=selected_sheet, header=header_row, nrows=10)
+                total_rows = get_excel_row_count(uploaded_file, selected_sheet, header_row)
+            else:
+                df = pd.read_excel(uploaded_file, sheet_name=selected_sheet, header=header_row)
+                total_rows = len(df)
 
-            st.write(f"**총 {len(df)}행 x {len(df.columns)}열**")
+            st.write(f"**총 {total_rows if total_rows is not None else '?'}행 x {len(df.columns)}열**")
 
             # 미리보기
             st.markdown("<p class='section-title'>미리보기 (상위 10행)</p>", unsafe_allow_html=True)
@@ -121,13 +130,47 @@ with tab1:
             # Import 실행
             st.divider()
 
+            # 같은 파일/설정으로 다시 실행하면 중단된 지점부터 이어서 가져오기
+            checkpoint_key = hashlib.sha256(
+                uploaded_file.getvalue() + json.dumps(
+                    [selected_sheet, header_row, mapping, duplicate_strategy], ensure_ascii=False
+                ).encode('utf-8')
+            ).hexdigest()
+            checkpoint = get_import_checkpoint(checkpoint_key) if streaming else None
+
+            if checkpoint:
+                st.warning(f"이전 가져오기가 {checkpoint['rows_done']}행까지 반영된 뒤 중단되었습니다. 실행하면 이어서 진행합니다.")
+                if st.button("처음부터 다시", use_container_width=True):
+                    clear_import_checkpoint(checkpoint_key)
+                    st.rerun()
+
             if st.button("가져오기 실행", type="primary", use_container_width=True):
                 with st.spinner("데이터 가져오는 중..."):
-                    result = import_from_excel(
-                        df=df,
-                        mapping=mapping,
-                        strategy=duplicate_strategy
-                    )
+                    if streaming:
+                        progress_bar = st.progress(0.0, text="가져오는 중...")
+
+                        def update_progress(rows_done, rows_total):
+                            if rows_total:
+                                progress_bar.progress(min(rows_done / rows_total, 1.0), text=f"{rows_done:,} / {rows_total:,}행")
+                            else:
+                                progress_bar.progress(0.0, text=f"{rows_done:,}행 처리")
+
+                        result = import_excel_stream(
+                            uploaded_file,
+                            mapping=mapping,
+                            strategy=duplicate_strategy,
+                            sheet_name=selected_sheet,
+                            header_row=header_row,
+                            progress_callback=update_progress,
+                            checkpoint_key=checkpoint_key
+                        )
+                        progress_bar.progress(1.0, text="완료")
+                    else:
+                        result = import_from_excel(
+                            df=df,
+                            mapping=mapping,
+                            strategy=duplicate_strategy
+                        )
 
                     st.success(f"""
                     Import 완료!
@@ -141,17 +184,15 @@ with tab1:
                             for error in result['errors']:
                                 st.error(error)
 
-                    st.cache_data.clear()
-
         except Exception as e:
             st.error(f"파일 처리 중 오류: {str(e)}")
 
 with tab2:
     st.markdown("<p class='section-title'>Excel 파일 내보내기</p>", unsafe_allow_html=True)
 
-    systems = get_all_systems()
+    systems = get_shared_system_records()
 
-    if systems:
+    if len(systems) > 0:
         col1, col2 = st.columns(2)
 
         with col1:
@@ -186,15 +227,14 @@ with tab2:
         # Export 실행
         if st.button("파일 생성", type="primary", use_container_width=True):
             with st.spinner("파일 생성 중..."):
-                # 데이터 로드
-                export_data = get_all_systems(include_deleted=include_deleted)
-
                 if export_format == "Excel (.xlsx)":
-                    output = export_to_excel(export_data, columns=selected_columns)
+                    # DB에서 바로 스트리밍하여 임시 파일로 생성 (download_button은 bytes로 전달)
+                    with export_systems_to_excel(columns=selected_columns, include_deleted=include_deleted) as spooled:
+                        output = spooled.read()
                     filename = f"개발시스템_현황_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
                     mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                 else:
-                    output = export_to_csv(export_data, columns=selected_columns)
+                    output = b''.join(export_systems_to_csv(columns=selected_columns, include_deleted=include_deleted))
                     filename = f"개발시스템_현황_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
                     mime = "text/csv"
 
@@ -210,12 +250,8 @@ with tab2:
         st.divider()
         st.markdown("<p class='section-title'>데이터 미리보기</p>", unsafe_allow_html=True)
 
-        preview_df = pd.DataFrame(systems)
-        if selected_columns:
-            preview_cols = [c for c in selected_columns if c in preview_df.columns]
-            preview_df = preview_df[preview_cols]
-
-        st.dataframe(preview_df.head(5), use_container_width=True)
+        preview_df = pd.DataFrame(systems.to_dicts(selected_columns or None, limit=5))
+        st.dataframe(preview_df, use_container_width=True)
         st.caption(f"총 {len(systems)}개 시스템")
 
     else:
@@ -294,7 +330,8 @@ with st.sidebar:
 
     with st.expander("대용량 파일 처리"):
         st.markdown("""
-        - **권장 크기**: 1,000행 이하
-        - **대용량 시**: 파일 분할 업로드
+        - **xlsx 권장**: 500행 단위로 나누어 읽고 커밋 (크기 제한 없음)
+        - **중단된 경우**: 같은 파일/설정으로 다시 실행하면 이어서 진행
+        - **xls 파일**: 전체를 한 번에 읽으므로 xlsx 변환 권장
         - **느린 경우**: 불필요한 컬럼 제거
         """)
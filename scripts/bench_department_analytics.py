@@ -0,0 +1,92 @@
+"""부서별 분석 벤치마크
+
+통계 리포트 부서별 탭이 쓰던 iterrows 행 반복 방식과 utils.analytics의 explode/groupby 방식을
+같은 합성 데이터로 비교하고, 두 결과(부서별 시스템 수, 평균 진행률)가 같은지 확인한다.
+
+    python scripts/bench_department_analytics.py [--sizes 10000,100000,1000000] [--loop-limit 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db import STATUS_OPTIONS
+from utils.analytics import explode_departments, department_summary
+
+DEPARTMENTS = [f"부서{i:02d}" for i in range(12)]
+
+
+def _make_systems(size, seed=0):
+    """시스템당 부서 0~3개인 합성 시스템 DataFrame"""
+    rng = np.random.default_rng(seed)
+    department_counts = rng.integers(0, 4, size)
+    department_codes = rng.integers(0, len(DEPARTMENTS), department_counts.sum())
+    offsets = np.concatenate([[0], np.cumsum(department_counts)])
+    return pd.DataFrame({
+        'id': np.arange(1, size + 1),
+        'system_name': [f"system-{i}" for i in range(size)],
+        'departments': [
+            [DEPARTMENTS[code] for code in department_codes[offsets[i]:offsets[i + 1]]]
+            for i in range(size)
+        ],
+        'status': pd.Categorical.from_codes(rng.integers(0, len(STATUS_OPTIONS), size), categories=STATUS_OPTIONS),
+        'progress': rng.random(size).round(2)
+    })
+
+
+def legacy_loop(df):
+    """이전 부서별 탭 방식 (행마다 부서를 펼쳐 dict 목록 생성)"""
+    dept_data = []
+    for _, row in df.iterrows():
+        if row['departments']:
+            for dept in row['departments']:
+                dept_data.append({
+                    'department': dept,
+                    'system_name': row['system_name'],
+                    'status': row['status'],
+                    'progress': row['progress']
+                })
+    dept_df = pd.DataFrame(dept_data)
+    grouped = dept_df.groupby('department')
+    return pd.DataFrame({'count': grouped.size(), 'avg_progress': grouped['progress'].mean()})
+
+
+def vectorized(df):
+    return department_summary(explode_departments(df))
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000', help='시스템 수 목록 (쉼표 구분)')
+    parser.add_argument('--loop-limit', type=int, default=1000000,
+                        help='이 크기보다 크면 행 반복 방식은 건너뜀 (기본: 1000000)')
+    args = parser.parse_args()
+
+    print(f"{'시스템 수':>10} {'행 반복(s)':>12} {'벡터화(s)':>12} {'배율':>8}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        df = _make_systems(size)
+        summary, vectorized_time = _timed(vectorized, df)
+
+        if size > args.loop_limit:
+            print(f"{size:>10,} {'-':>12} {vectorized_time:>12.3f} {'-':>8}")
+            continue
+
+        expected, loop_time = _timed(legacy_loop, df)
+        pd.testing.assert_series_equal(summary['count'], expected['count'], check_names=False)
+        pd.testing.assert_series_equal(summary['avg_progress'], expected['avg_progress'], check_names=False)
+        print(f"{size:>10,} {loop_time:>12.3f} {vectorized_time:>12.3f} {loop_time / vectorized_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
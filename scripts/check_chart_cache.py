@@ -0,0 +1,63 @@
+"""차트 캐시 키 점검
+
+utils.charts의 Figure 캐시 키(_fingerprint)가 서로 다른 입력을 구분하고,
+키로 쓸 수 없는 입력은 조용히 문자열로 바꾸지 않고 거부하는지 확인한다.
+
+    python scripts/check_chart_cache.py
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.charts import _fingerprint
+
+# (점검 이름, 입력 a, 입력 b) — 서로 다른 키가 나와야 함
+DISTINCT = [
+    # str()로는 앞뒤만 남아 같아지는 긴 배열
+    ('중간 값만 다른 긴 배열', np.zeros(2000), np.concatenate([np.zeros(1000), [1.0], np.zeros(999)])),
+    ('정수 키와 문자열 키 dict', {1: 10}, {'1': 10}),
+    ('numpy 정수와 문자열', np.int64(5), '5'),
+    ('dict와 쌍 목록', {'a': 1}, [['a', 1]]),
+]
+
+# (점검 이름, 입력 a, 입력 b) — 같은 키가 나와야 함
+EQUAL = [
+    ('numpy 스칼라와 파이썬 값', [np.int64(3), np.float64(0.5)], [3, 0.5]),
+    ('배열과 목록', np.arange(5), [0, 1, 2, 3, 4]),
+]
+
+# 키로 쓸 수 없어 TypeError가 나야 하는 입력
+REJECTED = [
+    ('pandas Series', pd.Series(range(2000))),
+    ('Period 키 dict', {pd.Period('2024-01', 'M'): 1}),
+]
+
+
+def main():
+    failed = False
+
+    def report(name, ok):
+        nonlocal failed
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failed = failed or not ok
+
+    for name, a, b in DISTINCT:
+        report(name, _fingerprint('builder', (a,), {}) != _fingerprint('builder', (b,), {}))
+    for name, a, b in EQUAL:
+        report(name, _fingerprint('builder', (a,), {}) == _fingerprint('builder', (b,), {}))
+    for name, value in REJECTED:
+        try:
+            _fingerprint('builder', (value,), {})
+            report(f"{name} 거부", False)
+        except TypeError:
+            report(f"{name} 거부", True)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
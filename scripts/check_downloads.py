@@ -0,0 +1,68 @@
+"""다운로드 버튼 점검 (streamlit 필요)
+
+임시 DB에 시스템을 등록한 뒤 Streamlit AppTest로 페이지를 실행하고 내보내기 버튼을 눌러,
+생성된 파일이 실제 st.download_button 경로를 오류 없이 통과하는지 확인한다.
+
+    python scripts/check_downloads.py
+"""
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# (페이지, 설정할 selectbox {라벨: 값}, 누를 버튼 라벨)
+CHECKS = [
+    ('pages/6_Excel_관리.py', {'파일 형식': 'Excel (.xlsx)'}, '파일 생성'),
+    ('pages/6_Excel_관리.py', {'파일 형식': 'CSV (.csv)'}, '파일 생성'),
+    ('pages/4_통계_리포트.py', {}, 'Excel 리포트 다운로드'),
+    ('pages/4_통계_리포트.py', {}, 'CSV 다운로드'),
+]
+
+
+def _run_check(page, selections, button_label):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT_DIR, page), default_timeout=60).run()
+    for label, value in selections.items():
+        next(s for s in app.selectbox if s.label == label).set_value(value).run()
+    next(b for b in app.button if b.label == button_label).click().run()
+
+    if app.exception:
+        return [e.message for e in app.exception]
+    if not app.get('download_button'):
+        return ["다운로드 버튼이 표시되지 않았습니다."]
+    return []
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # database.db를 가져오기 전에 임시 DB 경로 지정
+        os.environ['DEV_SYSTEMS_DB_PATH'] = os.path.join(tmp_dir, 'check_downloads.db')
+        from database.db import create_system, get_engine
+
+        create_system({
+            'system_name': '다운로드 점검',
+            'description': '점검용 시스템',
+            'status': '개발 중',
+            'progress': 0.5,
+            'departments': ['개발팀']
+        })
+
+        failed = False
+        for page, selections, button_label in CHECKS:
+            errors = _run_check(page, selections, button_label)
+            name = f"{page} [{', '.join(selections.values()) or button_label}]"
+            print(f"{'FAIL' if errors else 'OK  '} {name}")
+            for error in errors:
+                print(f"     {error}")
+            failed = failed or bool(errors)
+
+        get_engine().dispose()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""가져오기 재개 점검
+
+임시 DB에 스트리밍 가져오기를 실행하면서 청크 중간(중복 이름 분리 반영, 행 단위 재시도)에서
+프로세스가 죽은 상황을 흉내 낸 뒤, 같은 checkpoint_key로 다시 실행해
+행이 빠지거나 중복 생성되지 않는지 확인한다.
+
+    python scripts/check_import_resume.py
+"""
+import os
+import sys
+import tempfile
+from io import BytesIO
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+MAPPING = {'system_name': '시스템명', 'description': '설명', 'progress': '진행률', 'status': '상태'}
+
+# (점검 이름, 시스템명 목록, {_apply_import_rows 호출 순번: 발생시킬 예외}, 기대 시스템명)
+# 가져오기는 '새로 추가' 전략, 청크 크기 3으로 실행한다.
+CHECKS = [
+    # 'A'가 청크 안에서 중복되어 청크가 두 번에 나뉘어 반영되는 도중 중단
+    ('중복 이름 분리 반영', ['A', 'B', 'A', 'C', 'D'], {2: 'crash'},
+     ['A', 'A (3)', 'B', 'C', 'D']),
+    # 청크 반영이 실패해 행 단위 재시도로 넘어간 뒤 두 번째 행에서 중단
+    ('행 단위 재시도', ['F', 'G', 'H', 'I', 'J'], {1: 'error', 3: 'crash'},
+     ['F', 'G', 'H', 'I', 'J']),
+]
+
+
+class SimulatedCrash(BaseException):
+    """프로세스 중단 흉내 (except Exception에 잡히지 않음)"""
+
+
+def _make_source(names):
+    source = BytesIO()
+    pd.DataFrame({
+        '시스템명': names,
+        '설명': ['점검'] * len(names),
+        '진행률': [10] * len(names),
+        '상태': ['개발 중'] * len(names),
+    }).to_excel(source, index=False)
+    source.seek(0)
+    return source
+
+
+def _run_check(name, names, failures, expected):
+    import database.db as db
+    from utils.excel_handler import import_excel_stream
+
+    checkpoint_key = f"check-{name}"
+    before = {system['system_name'] for system in db.get_all_systems()}
+
+    apply_rows = db._apply_import_rows
+    calls = [0]
+
+    def failing(*args, **kwargs):
+        calls[0] += 1
+        failure = failures.get(calls[0])
+        if failure == 'crash':
+            raise SimulatedCrash()
+        if failure == 'error':
+            raise RuntimeError('청크 반영 실패')
+        return apply_rows(*args, **kwargs)
+
+    db._apply_import_rows = failing
+    try:
+        import_excel_stream(_make_source(names), MAPPING, strategy='새로 추가',
+                            chunk_size=3, checkpoint_key=checkpoint_key)
+        return ["중단이 발생하지 않았습니다."]
+    except SimulatedCrash:
+        pass
+    finally:
+        db._apply_import_rows = apply_rows
+
+    import_excel_stream(_make_source(names), MAPPING, strategy='새로 추가',
+                        chunk_size=3, checkpoint_key=checkpoint_key)
+    added = sorted(system['system_name'] for system in db.get_all_systems()
+                   if system['system_name'] not in before)
+    if added != expected:
+        return [f"재실행 후 추가된 시스템 {added} (기대: {expected})"]
+    return []
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # database.db를 가져오기 전에 임시 DB 경로 지정
+        os.environ['DEV_SYSTEMS_DB_PATH'] = os.path.join(tmp_dir, 'check_import_resume.db')
+        from database.db import get_engine
+
+        failed = False
+        for name, names, failures, expected in CHECKS:
+            errors = _run_check(name, names, failures, expected)
+            print(f"{'FAIL' if errors else 'OK  '} {name}")
+            for error in errors:
+                print(f"     {error}")
+            failed = failed or bool(errors)
+
+        get_engine().dispose()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""오래된 변경 이력 정리 및 압축 보관
+
+보관 기준일보다 오래된 system_history 행에서 no-op 변경을 지우고 같은 사용자의 연속 변경을
+병합한 뒤, 시스템별 zlib 압축 묶음으로 system_history_archive에 옮긴다.
+시스템 단위의 짧은 트랜잭션으로 처리하므로 앱 실행 중에도 주기 작업(cron 등)으로 돌릴 수 있다.
+
+    python scripts/compact_history.py [--days 180]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db import compact_history, HISTORY_ARCHIVE_DAYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=HISTORY_ARCHIVE_DAYS,
+                        help=f'이 일수보다 오래된 이력을 보관 (기본: {HISTORY_ARCHIVE_DAYS})')
+    args = parser.parse_args()
+
+    result = compact_history(older_than_days=args.days)
+    print(f"system_history: 시스템 {result['systems']}개, 보관 {result['archived']}행, "
+          f"병합 {result['merged']}행, no-op 제거 {result['dropped']}행")
+
+
+if __name__ == '__main__':
+    main()
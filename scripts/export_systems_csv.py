@@ -0,0 +1,33 @@
+"""시스템 목록 CSV 내보내기 (Streamlit 없이 실행)
+
+DB를 서버측 커서로 읽어 청크 단위로 기록하므로 파일 크기와 무관하게 메모리 사용량이 일정하다.
+
+    python scripts/export_systems_csv.py systems.csv [--columns system_name status progress] [--include-deleted]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.excel_handler import export_systems_to_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help='저장할 CSV 파일 경로')
+    parser.add_argument('--columns', nargs='+', help='내보낼 컬럼 (기본: 전체)')
+    parser.add_argument('--include-deleted', action='store_true', help='삭제된 시스템 포함')
+    args = parser.parse_args()
+
+    written = 0
+    with open(args.output, 'wb') as f:
+        for chunk in export_systems_to_csv(columns=args.columns, include_deleted=args.include_deleted):
+            f.write(chunk)
+            written += len(chunk)
+
+    print(f"{args.output}: {written / 1024 / 1024:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""대시보드 카운터 재계산 및 검증
+
+dashboard_stats 테이블을 전체 재계산 값과 비교해 다른 항목을 출력한 뒤 재계산 값으로 교체한다.
+불일치가 있으면 종료 코드 1을 반환하므로 주기 점검(cron 등)에 사용할 수 있다.
+
+    python scripts/rebuild_dashboard_stats.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db import rebuild_dashboard_stats
+
+
+def main():
+    mismatches = rebuild_dashboard_stats()
+    if not mismatches:
+        print("dashboard_stats: 불일치 없음")
+        return 0
+
+    print(f"dashboard_stats: {len(mismatches)}개 항목 불일치 (재계산 값으로 교체됨)")
+    for key, (stored, expected) in sorted(mismatches.items()):
+        print(f"  {key}: {stored:g} -> {expected:g}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,3 @@
 from .charts import create_status_pie, create_progress_histogram, create_dept_bar, create_cost_pie
-from .validators import validate_system_data, validate_service_data
+from .validators import validate_system_data, validate_systems_frame, validate_service_data
 from .excel_handler import import_from_excel, export_to_excel, export_to_csv, create_empty_template
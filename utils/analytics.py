@@ -0,0 +1,119 @@
+import pandas as pd
+
+from database.db import get_daily_snapshots, STATUS_OPTIONS
+
+SNAPSHOT_COLUMNS = ['day', 'system_id', 'progress', 'status']
+
+# 번다운에서 완료로 보는 상태
+DONE_STATUS = '운영 가능'
+
+
+def load_daily_snapshots(since=None):
+    """일별 스냅샷을 DataFrame으로 로드 (day: datetime64, status: category)"""
+    df = pd.DataFrame.from_records(get_daily_snapshots(since), columns=SNAPSHOT_COLUMNS)
+    df['day'] = pd.to_datetime(df['day'])
+    df['progress'] = df['progress'].astype(float)
+    df['status'] = pd.Categorical(df['status'], categories=STATUS_OPTIONS)
+    return df
+
+
+def monthly_progress_change(snapshots):
+    """월별 평균 진행률과 전월 대비 변화량
+
+    각 월의 마지막 스냅샷 일자를 그달 상태로 본다.
+    반환: month(YYYY-MM), avg_progress, change (첫 달은 NaN)
+    """
+    if snapshots.empty:
+        return pd.DataFrame(columns=['month', 'avg_progress', 'change'])
+
+    month = snapshots['day'].dt.to_period('M')
+    month_end = snapshots['day'] == snapshots.groupby(month)['day'].transform('max')
+    monthly = snapshots[month_end].groupby(month[month_end])['progress'].mean()
+
+    return pd.DataFrame({
+        'month': monthly.index.astype(str),
+        'avg_progress': monthly.values,
+        'change': monthly.diff().values
+    })
+
+
+def status_transitions(snapshots):
+    """스냅샷 사이 상태 전환 수 (월별)
+
+    snapshots는 system_id, day 순으로 정렬되어 있어야 한다.
+    반환: month(YYYY-MM), from_status, to_status, count
+    """
+    previous = snapshots.groupby('system_id', sort=False)['status'].shift()
+    changed = previous.notna() & (previous != snapshots['status'])
+    if not changed.any():
+        return pd.DataFrame(columns=['month', 'from_status', 'to_status', 'count'])
+
+    transitions = pd.DataFrame({
+        'month': snapshots.loc[changed, 'day'].dt.to_period('M').astype(str),
+        'from_status': previous[changed].astype(str),
+        'to_status': snapshots.loc[changed, 'status'].astype(str)
+    })
+    return transitions.groupby(['month', 'from_status', 'to_status']).size().reset_index(name='count')
+
+
+def burndown_series(snapshots):
+    """일자별 남은 시스템 수(완료 상태 제외)와 남은 작업량(1 - 진행률 합계)"""
+    if snapshots.empty:
+        return pd.DataFrame(columns=['day', 'remaining_systems', 'remaining_work'])
+
+    remaining = pd.DataFrame({
+        'day': snapshots['day'],
+        'remaining_systems': (snapshots['status'] != DONE_STATUS).astype(int),
+        'remaining_work': 1 - snapshots['progress'].fillna(0)
+    })
+    return remaining.groupby('day', as_index=False).sum()
+
+
+def explode_departments(systems, columns=('id', 'system_name', 'status', 'progress')):
+    """시스템 DataFrame의 부서 목록 컬럼을 (department, columns...) 행으로 펼침
+
+    부서가 없는 시스템은 제외된다.
+    """
+    exploded = systems[['departments', *columns]].explode('departments', ignore_index=True)
+    exploded = exploded[exploded['departments'].notna()].rename(columns={'departments': 'department'})
+    return exploded.reset_index(drop=True)
+
+
+def department_frame(records, columns=('id', 'system_name', 'status', 'progress')):
+    """SystemRecords를 (department, columns...) 행으로 펼침 (부서 코드 배열에서 바로 생성)"""
+    rows, departments = records.department_pairs()
+    frame = {'department': departments}
+    for column in columns:
+        frame[column] = records.column(column).take(rows).reset_index(drop=True)
+    return pd.DataFrame(frame)
+
+
+def department_summary(department_rows):
+    """부서별 시스템 수, 평균 진행률, 상태별 시스템 수
+
+    department_rows: explode_departments() 또는 department_frame() 결과
+    반환: department 인덱스, count / avg_progress / STATUS_OPTIONS 순 상태 컬럼
+    """
+    grouped = department_rows.groupby('department', observed=True, sort=True)
+    status_mix = (
+        department_rows.groupby(['department', 'status'], observed=True).size()
+        .unstack(fill_value=0)
+        .reindex(columns=STATUS_OPTIONS, fill_value=0)
+    )
+    summary = pd.DataFrame({
+        'count': grouped.size(),
+        'avg_progress': grouped['progress'].mean()
+    })
+    summary = summary.join(status_mix)
+    summary.index = summary.index.astype(object)
+    return summary.sort_index()
+
+
+def compute_progress_trends(snapshots):
+    """월별 진행률 변화, 상태 전환, 번다운을 한 번 정렬한 스냅샷에서 함께 계산"""
+    ordered = snapshots.sort_values(['system_id', 'day'], kind='stable', ignore_index=True)
+    return {
+        'monthly_progress': monthly_progress_change(ordered),
+        'transitions': status_transitions(ordered),
+        'burndown': burndown_series(ordered)
+    }
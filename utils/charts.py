@@ -1,32 +1,106 @@
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
 
-
-def create_status_pie(systems):
-    """상태별 시스템 분포 파이 차트"""
-    if not systems:
+# 프로세스 공용 Figure 캐시 크기 (초과 시 가장 오래 안 쓴 것부터 제거)
+CHART_CACHE_SIZE = 128
+
+# 상태별 색상 정의
+STATUS_COLORS = {
+    '초기 개발': '#FF6B6B',
+    '개발 중': '#4ECDC4',
+    '테스트 필요': '#FFE66D',
+    '운영 가능': '#95E1D3'
+}
+
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+
+def _key_value(value):
+    """캐시 키용 JSON 값으로 변환 (지원하지 않는 타입은 TypeError)
+
+    dict는 키 타입이 보존되도록 [키, 값] 쌍 목록으로 감싸고, numpy 배열/스칼라는 파이썬 값으로 바꾼다.
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, np.generic):
+        return _key_value(value.item())
+    if isinstance(value, np.ndarray):
+        return _key_value(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return [_key_value(item) for item in value]
+    if isinstance(value, dict):
+        return {'dict': [[_key_value(k), _key_value(v)] for k, v in value.items()]}
+    if isinstance(value, (date, datetime)):
+        return {'datetime' if isinstance(value, datetime) else 'date': value.isoformat()}
+    raise TypeError(f"차트 캐시 키로 쓸 수 없는 값: {type(value).__name__}")
+
+
+def _fingerprint(name, args, kwargs):
+    """빌더 이름과 입력 내용의 해시"""
+    payload = json.dumps([name, _key_value(args), _key_value(kwargs)], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def memoize_figure(builder):
+    """입력 내용 해시로 Figure를 캐시하는 데코레이터 (LRU, 모든 세션 공유)
+
+    입력은 집계된 작은 값(dict, list, 숫자, 문자열, 날짜, numpy 배열/스칼라)이어야 하며,
+    그 외 타입(pandas 객체 등)은 TypeError로 거부한다.
+    반환된 Figure는 다른 세션과 공유되므로 수정하지 않는다.
+    """
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        key = _fingerprint(builder.__name__, args, kwargs)
+        with _figure_cache_lock:
+            fig = _figure_cache.get(key)
+            if fig is not None:
+                _figure_cache.move_to_end(key)
+                return fig
+
+        fig = builder(*args, **kwargs)
+        with _figure_cache_lock:
+            _figure_cache[key] = fig
+            while len(_figure_cache) > CHART_CACHE_SIZE:
+                _figure_cache.popitem(last=False)
+        return fig
+
+    return wrapper
+
+
+def clear_chart_cache():
+    """Figure 캐시 비우기"""
+    with _figure_cache_lock:
+        _figure_cache.clear()
+
+
+def progress_bins(progress):
+    """진행률(0~1) 값을 10% 구간별 개수 목록으로 집계"""
+    values = np.asarray(progress, dtype=float) * 100
+    counts, _ = np.histogram(values[~np.isnan(values)], bins=10, range=(0, 100))
+    return counts.tolist()
+
+
+@memoize_figure
+def create_status_pie(status_counts):
+    """상태별 시스템 분포 파이 차트 (status_counts: {상태: 개수})"""
+    status_counts = {status: count for status, count in status_counts.items() if count > 0}
+    if not status_counts:
         return go.Figure()
 
-    df = pd.DataFrame(systems)
-    status_counts = df['status'].value_counts().reset_index()
-    status_counts.columns = ['status', 'count']
-
-    # 상태별 색상 정의
-    color_map = {
-        '초기 개발': '#FF6B6B',
-        '개발 중': '#4ECDC4',
-        '테스트 필요': '#FFE66D',
-        '운영 가능': '#95E1D3'
-    }
-
-    colors = [color_map.get(s, '#888888') for s in status_counts['status']]
-
     fig = go.Figure(data=[go.Pie(
-        labels=status_counts['status'],
-        values=status_counts['count'],
+        labels=list(status_counts),
+        values=list(status_counts.values()),
         hole=0.4,
-        marker_colors=colors,
+        marker_colors=[STATUS_COLORS.get(s, '#888888') for s in status_counts],
         textinfo='label+percent',
         textposition='outside'
     )])
@@ -41,17 +115,16 @@ def create_status_pie(systems):
     return fig
 
 
-def create_progress_histogram(systems):
-    """진행률 분포 히스토그램"""
-    if not systems:
+@memoize_figure
+def create_progress_histogram(bin_counts):
+    """진행률 분포 히스토그램 (bin_counts: progress_bins() 결과, 10% 구간별 개수)"""
+    if not any(bin_counts):
         return go.Figure()
 
-    df = pd.DataFrame(systems)
-    df['progress_pct'] = df['progress'] * 100
-
-    fig = go.Figure(data=[go.Histogram(
-        x=df['progress_pct'],
-        nbinsx=10,
+    fig = go.Figure(data=[go.Bar(
+        x=[i * 10 + 5 for i in range(len(bin_counts))],
+        y=bin_counts,
+        width=9,
         marker_color='#0066CC',
         opacity=0.8
     )])
@@ -59,7 +132,6 @@ def create_progress_histogram(systems):
     fig.update_layout(
         xaxis_title='진행률 (%)',
         yaxis_title='시스템 수',
-        bargap=0.1,
         margin=dict(t=20, b=40, l=40, r=20),
         height=350
     )
@@ -69,22 +141,20 @@ def create_progress_histogram(systems):
     return fig
 
 
+@memoize_figure
 def create_dept_bar(dept_distribution):
-    """부서별 시스템 수 막대 그래프"""
+    """부서별 시스템 수 막대 그래프 (dept_distribution: {부서: 개수})"""
     if not dept_distribution:
         return go.Figure()
 
-    df = pd.DataFrame([
-        {'department': k, 'count': v}
-        for k, v in dept_distribution.items()
-    ]).sort_values('count', ascending=True)
+    items = sorted(dept_distribution.items(), key=lambda item: item[1])
 
     fig = go.Figure(data=[go.Bar(
-        x=df['count'],
-        y=df['department'],
+        x=[count for _, count in items],
+        y=[department for department, _ in items],
         orientation='h',
         marker_color='#0066CC',
-        text=df['count'],
+        text=[count for _, count in items],
         textposition='outside'
     )])
 
@@ -98,16 +168,15 @@ def create_dept_bar(dept_distribution):
     return fig
 
 
-def create_cost_pie(services):
-    """서비스별 비용 비중 파이 차트"""
-    if not services:
+@memoize_figure
+def create_cost_pie(service_costs):
+    """서비스별 비용 비중 파이 차트 (service_costs: {서비스명: 월 비용})"""
+    if not service_costs:
         return go.Figure()
 
-    df = pd.DataFrame(services)
-
     fig = go.Figure(data=[go.Pie(
-        labels=df['service_name'],
-        values=df['monthly_cost'],
+        labels=list(service_costs),
+        values=list(service_costs.values()),
         hole=0.4,
         textinfo='label+percent',
         textposition='outside'
@@ -123,16 +192,122 @@ def create_cost_pie(services):
     return fig
 
 
+@memoize_figure
+def create_horizontal_bar(values, x_title, y_title, color_scale='Blues', height=350):
+    """값 크기로 색칠한 가로 막대 그래프 (values: {라벨: 값}, 입력 순서대로 아래에서 위로)"""
+    if not values:
+        return go.Figure()
+
+    fig = px.bar(
+        x=list(values.values()),
+        y=list(values),
+        orientation='h',
+        color=list(values.values()),
+        color_continuous_scale=color_scale
+    )
+    fig.update_layout(
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        margin=dict(t=20, b=40, l=100, r=20),
+        height=height,
+        showlegend=False,
+        coloraxis_showscale=False
+    )
+
+    return fig
+
+
+@memoize_figure
+def create_vertical_bar(values, x_title, y_title, color_scale='RdYlGn', height=350):
+    """값 크기로 색칠한 세로 막대 그래프 (values: {라벨: 값})"""
+    if not values:
+        return go.Figure()
+
+    fig = px.bar(
+        x=list(values),
+        y=list(values.values()),
+        color=list(values.values()),
+        color_continuous_scale=color_scale
+    )
+    fig.update_layout(
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        margin=dict(t=20, b=40, l=40, r=20),
+        height=height,
+        showlegend=False,
+        coloraxis_showscale=False
+    )
+
+    return fig
+
+
+@memoize_figure
+def create_stacked_bar(rows, x_title, y_title, height=350):
+    """그룹별 누적 세로 막대 그래프 (rows: [(x, 그룹, 값), ...])"""
+    if not rows:
+        return go.Figure()
+
+    groups = {}
+    for x, group, value in rows:
+        groups.setdefault(group, ([], []))
+        groups[group][0].append(x)
+        groups[group][1].append(value)
+
+    fig = go.Figure(data=[
+        go.Bar(x=xs, y=ys, name=group) for group, (xs, ys) in groups.items()
+    ])
+    fig.update_layout(
+        barmode='stack',
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        margin=dict(t=20, b=40, l=40, r=20),
+        height=height
+    )
+
+    return fig
+
+
+@memoize_figure
+def create_burndown(days, remaining_systems, remaining_work):
+    """번다운 라인 차트 (일자별 미완료 시스템 수와 남은 작업량)"""
+    if not days:
+        return go.Figure()
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=days,
+        y=remaining_systems,
+        name='미완료 시스템 수',
+        mode='lines',
+        line=dict(color='#FF6B6B', width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=days,
+        y=remaining_work,
+        name='남은 작업량 (시스템 환산)',
+        mode='lines',
+        line=dict(color='#0066CC', width=2, dash='dot')
+    ))
+    fig.update_layout(
+        xaxis_title='일자',
+        yaxis_title='시스템 수',
+        margin=dict(t=20, b=40, l=40, r=20),
+        height=350,
+        legend=dict(orientation='h', y=1.1)
+    )
+
+    return fig
+
+
+@memoize_figure
 def create_monthly_trend(monthly_data):
-    """월별 추이 라인 차트"""
+    """월별 추이 라인 차트 (monthly_data: [{'month', 'value'}, ...])"""
     if not monthly_data:
         return go.Figure()
 
-    df = pd.DataFrame(monthly_data)
-
     fig = go.Figure(data=[go.Scatter(
-        x=df['month'],
-        y=df['value'],
+        x=[row['month'] for row in monthly_data],
+        y=[row['value'] for row in monthly_data],
         mode='lines+markers',
         line=dict(color='#0066CC', width=2),
         marker=dict(size=8)
@@ -148,6 +323,7 @@ def create_monthly_trend(monthly_data):
     return fig
 
 
+@memoize_figure
 def create_progress_gauge(progress):
     """진행률 게이지 차트"""
     fig = go.Figure(go.Indicator(
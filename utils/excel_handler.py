@@ -1,16 +1,167 @@
 import pandas as pd
-from io import BytesIO
-from datetime import datetime
+import codecs
+import csv
+from io import BytesIO, StringIO
+from itertools import chain, islice
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter
 import os
 import sys
+import tempfile
 
 # 상위 디렉토리 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def import_from_excel(df, mapping, strategy='덮어쓰기'):
-    """Excel 파일에서 데이터 가져오기"""
-    from database.db import get_system_by_name, create_system, update_system
+    """Excel 파일에서 데이터 가져오기 (일괄 변환/검증 후 청크 단위 upsert)
+
+    검증에 실패한 행은 DB에 쓰지 않고 행 번호와 함께 오류로 보고한다.
+    """
+    from database.db import bulk_upsert_systems
+    from utils.validators import validate_systems_frame
+
+    converted = convert_import_frame(df, mapping)
+    validation = validate_systems_frame(converted)
+
+    invalid = [
+        f"행 {idx + 1}: {message}"
+        for idx, messages in validation['errors'].items()
+        for message in messages
+    ]
+    valid = converted[validation['valid']]
+    rows = list(zip(valid.index + 1, valid.to_dict('records')))
+
+    result = bulk_upsert_systems(rows, strategy=strategy)
+    result['failed'] += len(validation['errors'])
+    result['errors'] = invalid + result['errors']
+    return result
+
+
+def convert_import_frame(df, mapping):
+    """매핑된 Excel 컬럼을 DB 컬럼 값으로 일괄 변환 (NaN → None)"""
+    converted = pd.DataFrame(index=df.index)
+
+    for db_col, excel_col in mapping.items():
+        if not excel_col or excel_col == '건너뛰기':
+            continue
+
+        if excel_col in df.columns:
+            values = df[excel_col]
+        else:
+            values = pd.Series(None, index=df.index, dtype=object)
+        present = values.notna()
+
+        # 진행률 변환 (100 단위 입력은 0~1로, 숫자가 아니면 0)
+        if db_col == 'progress':
+            numeric = pd.to_numeric(values, errors='coerce')
+            numeric = numeric.where(numeric <= 1, numeric / 100)
+            values = numeric.where(numeric.notna() | ~present, 0.0)
+
+        # 부서 리스트 변환
+        elif db_col == 'departments':
+            values = values.map(
+                lambda v: [d.strip() for d in v.split(',') if d.strip()] if isinstance(v, str) else [],
+                na_action='ignore'
+            )
+
+        # 날짜 변환
+        elif db_col in ['start_date', 'target_date']:
+            if pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.date
+            else:
+                is_str = values.map(lambda v: isinstance(v, str))
+                parsed = pd.to_datetime(values.where(is_str), format='%Y-%m-%d', errors='coerce').dt.date
+                others = values.map(lambda v: v.date() if hasattr(v, 'date') else v, na_action='ignore')
+                values = parsed.where(is_str, others)
+
+        values = values.astype(object)
+        converted[db_col] = values.where(values.notna(), None)
+
+    return converted
+
+
+STREAM_CHUNK_SIZE = 500
+MAX_IMPORT_ERRORS = 1000  # 누적 보관할 오류 메시지 수 (건수 집계는 계속됨)
+
+
+def _open_sheet(source, sheet_name=None):
+    """read_only 모드로 워크북/시트 열기"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    worksheet = workbook[sheet_name] if sheet_name else workbook.active
+    return workbook, worksheet
+
+
+def get_excel_row_count(source, sheet_name=None, header_row=0):
+    """시트의 데이터 행 수 (시트 메타데이터 기준, 알 수 없으면 None)"""
+    workbook, worksheet = _open_sheet(source, sheet_name)
+    try:
+        if worksheet.max_row is None:
+            return None
+        return max(worksheet.max_row - header_row - 1, 0)
+    finally:
+        workbook.close()
+
+
+def iter_excel_chunks(source, sheet_name=None, header_row=0, chunk_size=STREAM_CHUNK_SIZE, start_row=0):
+    """시트를 chunk_size 행씩 DataFrame으로 읽기 (메모리 사용량 일정)
+
+    DataFrame 인덱스는 pd.read_excel과 같은 0부터 시작하는 데이터 행 번호이며,
+    start_row 이전 행은 DataFrame을 만들지 않고 건너뛴다.
+    """
+    workbook, worksheet = _open_sheet(source, sheet_name)
+    try:
+        rows = worksheet.iter_rows(values_only=True)
+        for _ in range(header_row):
+            next(rows, None)
+
+        header = next(rows, None)
+        if header is None:
+            return
+        # pd.read_excel과 같은 컬럼명 규칙 (빈 헤더 → 'Unnamed: n', 중복 → 'name.1')
+        columns, seen = [], {}
+        for idx, name in enumerate(header):
+            name = name if name is not None else f"Unnamed: {idx}"
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            columns.append(name)
+
+        buffer, index = [], []
+        for row_idx, values in enumerate(rows):
+            if row_idx < start_row:
+                continue
+            if all(v is None for v in values):
+                continue
+            buffer.append(values[:len(columns)])
+            index.append(row_idx)
+
+            if len(buffer) >= chunk_size:
+                yield row_idx + 1, pd.DataFrame(buffer, columns=columns, index=index)
+                buffer, index = [], []
+
+        if buffer:
+            yield index[-1] + 1, pd.DataFrame(buffer, columns=columns, index=index)
+    finally:
+        workbook.close()
+
+
+def import_excel_stream(source, mapping, strategy='덮어쓰기', sheet_name=None, header_row=0,
+                        chunk_size=STREAM_CHUNK_SIZE, progress_callback=None, checkpoint_key=None):
+    """대용량 Excel 파일을 청크 단위로 읽어 가져오기
+
+    청크마다 import_from_excel로 검증/커밋하고 progress_callback(처리 행 수, 전체 행 수)를 호출한다.
+    청크 반영과 재개 지점(checkpoint_key를 준 경우) 저장은 한 트랜잭션으로 커밋되므로,
+    중단 후 같은 키로 다시 실행하면 이미 반영된 청크만 정확히 건너뛰고 이어서 진행한다.
+    """
+    from database.db import (
+        session_scope, ensure_daily_snapshot,
+        get_import_checkpoint, save_import_checkpoint, clear_import_checkpoint
+    )
 
     result = {
         'success': 0,
@@ -18,144 +169,167 @@ def import_from_excel(df, mapping, strategy='덮어쓰기'):
         'skipped': 0,
         'errors': []
     }
+    rows_done = 0
+
+    if checkpoint_key:
+        checkpoint = get_import_checkpoint(checkpoint_key)
+        if checkpoint:
+            rows_done = checkpoint['rows_done']
+            result.update(checkpoint['result'] or {})
+
+    total_rows = get_excel_row_count(source, sheet_name, header_row)
+    if progress_callback:
+        progress_callback(rows_done, total_rows)
+
+    file_name = getattr(source, 'name', None)
+    # 일별 스냅샷은 청크 트랜잭션과 분리해 먼저 기록
+    ensure_daily_snapshot()
+    for rows_read, chunk in iter_excel_chunks(source, sheet_name, header_row, chunk_size, start_row=rows_done):
+        with session_scope():
+            chunk_result = import_from_excel(chunk, mapping, strategy)
+            for key in ['success', 'failed', 'skipped']:
+                result[key] += chunk_result[key]
+            result['errors'] = (result['errors'] + chunk_result['errors'])[:MAX_IMPORT_ERRORS]
+
+            if checkpoint_key:
+                save_import_checkpoint(checkpoint_key, rows_read, result, file_name=file_name)
+        rows_done = rows_read
+
+        if progress_callback:
+            progress_callback(rows_done, total_rows)
+
+    if checkpoint_key:
+        clear_import_checkpoint(checkpoint_key)
 
-    for idx, row in df.iterrows():
-        try:
-            # 매핑에 따라 데이터 변환
-            data = {}
-
-            for db_col, excel_col in mapping.items():
-                if excel_col and excel_col != '건너뛰기':
-                    value = row.get(excel_col)
-
-                    # NaN 처리
-                    if pd.isna(value):
-                        value = None
-
-                    # 진행률 변환
-                    if db_col == 'progress' and value is not None:
-                        try:
-                            value = float(value)
-                            if value > 1:
-                                value = value / 100
-                        except (ValueError, TypeError):
-                            value = 0.0
-
-                    # 부서 리스트 변환
-                    if db_col == 'departments' and value is not None:
-                        if isinstance(value, str):
-                            value = [d.strip() for d in value.split(',') if d.strip()]
-                        else:
-                            value = []
-
-                    # 날짜 변환
-                    if db_col in ['start_date', 'target_date'] and value is not None:
-                        if isinstance(value, str):
-                            try:
-                                value = datetime.strptime(value, '%Y-%m-%d').date()
-                            except ValueError:
-                                value = None
-                        elif hasattr(value, 'date'):
-                            value = value.date()
-
-                    data[db_col] = value
-
-            # 필수 필드 확인
-            if not data.get('system_name'):
-                result['errors'].append(f"행 {idx + 1}: 시스템명이 없습니다.")
-                result['failed'] += 1
-                continue
+    return result
 
-            # 기존 시스템 확인
-            existing = get_system_by_name(data['system_name'])
-
-            if existing:
-                if strategy == '덮어쓰기':
-                    update_system(existing['id'], data)
-                    result['success'] += 1
-                elif strategy == '건너뛰기':
-                    result['skipped'] += 1
-                else:  # '새로 추가'
-                    # 이름에 번호 추가
-                    data['system_name'] = f"{data['system_name']} ({idx + 1})"
-                    create_system(data)
-                    result['success'] += 1
-            else:
-                create_system(data)
-                result['success'] += 1
 
-        except Exception as e:
-            result['errors'].append(f"행 {idx + 1}: {str(e)}")
-            result['failed'] += 1
+EXPORT_DATE_COLUMNS = ['start_date', 'target_date', 'created_at', 'updated_at']
+EXPORT_WIDTH_SAMPLE = 500  # 열 너비 추정에 사용할 앞부분 행 수
+EXPORT_SPOOL_SIZE = 16 * 1024 * 1024  # 이 크기를 넘으면 임시 파일로 기록
+
+
+def _format_export_value(column, value):
+    """내보내기용 값 변환 (진행률 %, 부서 문자열, 날짜)"""
+    if column == 'progress':
+        return f"{value * 100:.0f}%" if value else "0%"
+    if column == 'departments':
+        return ', '.join(value) if isinstance(value, list) else ''
+    if column in EXPORT_DATE_COLUMNS:
+        return value.strftime('%Y-%m-%d') if value else None
+    return value
 
-    return result
+
+def write_excel_stream(rows, columns=None, sheet_name='시스템 목록'):
+    """dict 행 이터러블을 write_only 워크북으로 기록하고 임시 파일 객체 반환
+
+    행을 한 번에 메모리에 올리지 않으며, 열 너비는 앞부분 표본으로 추정한다.
+    """
+    rows = iter(rows)
+    sample = list(islice(rows, EXPORT_WIDTH_SAMPLE))
+
+    # 컬럼 선택 (데이터가 없으면 빈 시트)
+    if not sample:
+        columns = []
+    elif columns:
+        columns = [c for c in columns if c in sample[0]]
+    else:
+        columns = list(sample[0].keys())
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+
+    sample_values = [[_format_export_value(c, row.get(c)) for c in columns] for row in sample]
+
+    # 컬럼 너비 자동 조정 (write_only는 행 기록 전에 지정해야 함)
+    for idx, col in enumerate(columns):
+        max_length = max(
+            [len(str(values[idx])) for values in sample_values if values[idx] is not None] + [len(col)]
+        ) + 2
+        worksheet.column_dimensions[get_column_letter(idx + 1)].width = min(max_length, 50)
+
+    if columns:
+        worksheet.append(columns)
+    for values in sample_values:
+        worksheet.append(values)
+    for row in rows:
+        worksheet.append([_format_export_value(c, row.get(c)) for c in columns])
+
+    output = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+    workbook.save(output)
+    output.seek(0)
+    return output
 
 
 def export_to_excel(systems, columns=None):
     """시스템 데이터를 Excel로 내보내기"""
-    if not systems:
-        df = pd.DataFrame()
-    else:
-        df = pd.DataFrame(systems)
+    with write_excel_stream(systems, columns) as output:
+        return output.read()
 
-        # 컬럼 선택
-        if columns:
-            df = df[[c for c in columns if c in df.columns]]
 
-        # 진행률 퍼센트 변환
-        if 'progress' in df.columns:
-            df['progress'] = df['progress'].apply(lambda x: f"{x * 100:.0f}%" if x else "0%")
+def export_systems_to_excel(columns=None, include_deleted=False):
+    """DB에서 시스템을 스트리밍 조회하여 Excel 파일 객체로 내보내기 (대용량용)
 
-        # 부서 리스트 문자열 변환
-        if 'departments' in df.columns:
-            df['departments'] = df['departments'].apply(
-                lambda x: ', '.join(x) if isinstance(x, list) else ''
-            )
+    SpooledTemporaryFile을 반환하므로 st.download_button에는 read()한 bytes를 넘긴다.
+    """
+    from database.db import iter_systems
 
-        # 날짜 형식 변환
-        for col in ['start_date', 'target_date', 'created_at', 'updated_at']:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col]).dt.strftime('%Y-%m-%d')
+    return write_excel_stream(iter_systems(include_deleted=include_deleted, columns=columns), columns)
 
-    # Excel 파일 생성
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='시스템 목록')
 
-        # 컬럼 너비 자동 조정
-        worksheet = writer.sheets['시스템 목록']
-        for idx, col in enumerate(df.columns):
-            max_length = max(
-                df[col].astype(str).map(len).max() if len(df) > 0 else 0,
-                len(col)
-            ) + 2
-            worksheet.column_dimensions[chr(65 + idx)].width = min(max_length, 50)
+CSV_CHUNK_ROWS = 1000
 
-    output.seek(0)
-    return output.getvalue()
 
+def iter_csv_stream(rows, columns=None, chunk_rows=CSV_CHUNK_ROWS):
+    """dict 행 이터러블을 UTF-8(BOM) CSV 바이트 청크로 변환하는 제너레이터
 
-def export_to_csv(systems, columns=None):
-    """시스템 데이터를 CSV로 내보내기"""
-    if not systems:
-        df = pd.DataFrame()
+    Streamlit 밖(스크립트 등)에서도 파일에 바로 기록할 수 있다.
+
+        with open('systems.csv', 'wb') as f:
+            for chunk in export_systems_to_csv():
+                f.write(chunk)
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+
+    yield codecs.BOM_UTF8
+    if first is None:
+        return
+
+    if columns:
+        columns = [c for c in columns if c in first]
     else:
-        df = pd.DataFrame(systems)
+        columns = list(first.keys())
 
-        if columns:
-            df = df[[c for c in columns if c in df.columns]]
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator=os.linesep)
+    writer.writerow(columns)
 
-        # 진행률 퍼센트 변환
-        if 'progress' in df.columns:
-            df['progress'] = df['progress'].apply(lambda x: f"{x * 100:.0f}%" if x else "0%")
+    for count, row in enumerate(chain([first], rows), start=1):
+        # 날짜는 원래 값 그대로, 진행률/부서만 변환
+        writer.writerow([
+            _format_export_value(c, row.get(c)) if c in ('progress', 'departments') else row.get(c)
+            for c in columns
+        ])
+        if count % chunk_rows == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
 
-        # 부서 리스트 문자열 변환
-        if 'departments' in df.columns:
-            df['departments'] = df['departments'].apply(
-                lambda x: ', '.join(x) if isinstance(x, list) else ''
-            )
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def export_to_csv(systems, columns=None):
+    """시스템 데이터를 CSV로 내보내기"""
+    return b''.join(iter_csv_stream(systems, columns))
+
+
+def export_systems_to_csv(columns=None, include_deleted=False):
+    """DB에서 시스템을 스트리밍 조회하여 CSV 바이트 청크로 반환하는 제너레이터 (대용량용)"""
+    from database.db import iter_systems
 
-    return df.to_csv(index=False, encoding='utf-8-sig').encode('utf-8-sig')
+    return iter_csv_stream(iter_systems(include_deleted=include_deleted, columns=columns), columns)
 
 
 def create_empty_template():
@@ -212,7 +386,7 @@ def create_empty_template():
 
         # 컬럼 너비 조정
         for idx, col in enumerate(df.columns):
-            worksheet.column_dimensions[chr(65 + idx)].width = 20
+            worksheet.column_dimensions[get_column_letter(idx + 1)].width = 20
 
     output.seek(0)
     return output.getvalue()
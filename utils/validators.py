@@ -1,6 +1,26 @@
 import re
 from datetime import date
 
+import numpy as np
+import pandas as pd
+
+from database.db import STATUS_OPTIONS
+
+# 가져오기 시 비어 있으면 안 되는 필드 (프레임에 없는 필드는 기본값이 적용되므로 시스템명만 항상 검사)
+REQUIRED_SYSTEM_FIELDS = {
+    'system_name': "시스템명은 필수입니다.",
+    'description': "서비스 개요는 필수입니다.",
+    'status': "상태는 필수입니다."
+}
+
+URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
+    r'localhost|'  # localhost
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
 
 def validate_system_data(data):
     """시스템 데이터 유효성 검증"""
@@ -17,7 +37,7 @@ def validate_system_data(data):
 
     if not data.get('status'):
         errors.append("상태는 필수입니다.")
-    elif data['status'] not in ['초기 개발', '개발 중', '테스트 필요', '운영 가능']:
+    elif data['status'] not in STATUS_OPTIONS:
         errors.append("유효하지 않은 상태값입니다.")
 
     # 진행률 검증
@@ -30,14 +50,7 @@ def validate_system_data(data):
     # URL 검증 (선택)
     url = data.get('url')
     if url:
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
-            r'localhost|'  # localhost
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        if not url_pattern.match(url):
+        if not URL_PATTERN.match(url):
             errors.append("유효하지 않은 URL 형식입니다.")
 
     # 날짜 검증
@@ -55,6 +68,73 @@ def validate_system_data(data):
     }
 
 
+def _blank(values):
+    """값이 없거나 공백 문자열인 행"""
+    return values.isna() | (values.astype(str).str.strip() == '')
+
+
+def validate_systems_frame(df):
+    """시스템 DataFrame 일괄 유효성 검증 (validate_system_data와 같은 규칙을 컬럼 단위로 적용)
+
+    df는 DB 컬럼명을 쓰는 프레임(convert_import_frame 결과 등)이다.
+    필수 필드는 프레임에 있는 것만 검사하되 시스템명은 항상 검사한다.
+
+    반환:
+        valid: 행별 통과 여부 bool Series (df와 같은 인덱스)
+        errors: 실패한 행의 오류 메시지 목록 Series (실패 행 인덱스만 포함)
+    """
+    rules = {}
+
+    for field, message in REQUIRED_SYSTEM_FIELDS.items():
+        if field in df.columns:
+            rules[message] = _blank(df[field])
+        elif field == 'system_name':
+            rules[message] = pd.Series(True, index=df.index)
+
+    if 'system_name' in df.columns:
+        rules["시스템명은 200자를 초과할 수 없습니다."] = df['system_name'].astype(str).str.len() > 200
+
+    if 'status' in df.columns:
+        status = df['status']
+        rules["유효하지 않은 상태값입니다."] = ~_blank(status) & ~status.isin(STATUS_OPTIONS)
+
+    if 'progress' in df.columns:
+        progress = pd.to_numeric(df['progress'], errors='coerce')
+        present = df['progress'].notna()
+        rules["진행률은 숫자여야 합니다."] = present & progress.isna()
+        rules["진행률은 0~1 사이의 값이어야 합니다."] = (progress < 0) | (progress > 1)
+
+    if 'url' in df.columns:
+        url = df['url']
+        present = ~_blank(url)
+        matched = url[present].astype(str).str.match(URL_PATTERN).astype(bool)
+        rules["유효하지 않은 URL 형식입니다."] = present & ~matched.reindex(df.index, fill_value=True)
+
+    if 'start_date' in df.columns and 'target_date' in df.columns:
+        start = pd.to_datetime(df['start_date'], errors='coerce')
+        target = pd.to_datetime(df['target_date'], errors='coerce')
+        rules["시작일이 목표 완료일보다 늦을 수 없습니다."] = start > target
+
+    masks = pd.DataFrame(rules, index=df.index, dtype=bool)
+    invalid = masks.any(axis=1)
+
+    # 실패 행마다 규칙 조합을 비트 패턴으로 만들고, 조합별 메시지 목록을 한 번만 구성
+    messages = list(rules)
+    patterns = masks[invalid].to_numpy().dot(1 << np.arange(len(messages), dtype=np.int64))
+    lists = {
+        pattern: [message for bit, message in enumerate(messages) if pattern >> bit & 1]
+        for pattern in np.unique(patterns).tolist()
+    }
+    errors = pd.Series(
+        [list(lists[pattern]) for pattern in patterns.tolist()], index=df.index[invalid], dtype=object
+    )
+
+    return {
+        'valid': ~invalid,
+        'errors': errors
+    }
+
+
 def validate_service_data(data):
     """서비스 데이터 유효성 검증"""
     errors = []